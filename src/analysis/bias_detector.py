@@ -1,25 +1,65 @@
 from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics import pairwise_distances
+from sklearn.metrics import pairwise_distances_chunked
+from sklearn.preprocessing import normalize
 import numpy as np
 
 class BiasDetector:
-    def __init__(self, headlines):
+    def __init__(self, headlines, metric='cosine'):
         self.headlines = headlines
+        self.metric = metric
         self.vectorizer = CountVectorizer()
         self.vectorized_data = self.vectorizer.fit_transform(headlines)
+        self._bias_scores = None
 
     def detect_bias(self):
-        # Calculate pairwise distances between headlines
-        distances = pairwise_distances(self.vectorized_data.toarray(), metric='cosine')
-        bias_scores = np.mean(distances, axis=1)
-        return bias_scores
+        """Mean distance from each headline to all headlines (itself included,
+        at distance 0), without building the n x n distance matrix."""
+        if self._bias_scores is None:
+            if self.metric == 'cosine':
+                self._bias_scores = mean_cosine_distances(self.vectorized_data)
+            else:
+                self._bias_scores = mean_distances_chunked(self.vectorized_data, self.metric)
+        return self._bias_scores
 
     def analyze_bias(self):
         bias_scores = self.detect_bias()
         bias_analysis = {headline: score for headline, score in zip(self.headlines, bias_scores)}
         return bias_analysis
 
+    def biased_indices(self, threshold=0.5):
+        """Positions of headlines whose bias score exceeds `threshold`."""
+        return np.flatnonzero(self.detect_bias() > threshold)
+
     def get_biased_headlines(self, threshold=0.5):
-        bias_analysis = self.analyze_bias()
-        biased_headlines = {headline: score for headline, score in bias_analysis.items() if score > threshold}
-        return biased_headlines
\ No newline at end of file
+        bias_scores = self.detect_bias()
+        biased_headlines = {}
+        for i in self.biased_indices(threshold):
+            biased_headlines[self.headlines[i]] = bias_scores[i]
+        return biased_headlines
+
+
+def mean_cosine_distances(X):
+    """Row means of the cosine distance matrix of sparse X in O(nnz) memory.
+
+    With rows L2-normalized to u_i and s = sum of all u_j, the mean cosine
+    similarity of row i is u_i . s / n (the centroid identity). As in
+    sklearn, a row's distance to itself counts as 0 and all-zero rows are
+    at distance 1 from every other row.
+    """
+    n = X.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    U = normalize(X.astype(np.float64), norm='l2')
+    total = np.asarray(U.sum(axis=0)).ravel()
+    similarity_sum = U @ total
+    self_similarity = np.asarray(U.multiply(U).sum(axis=1)).ravel()
+    # Sum over j != i of (1 - u_i . u_j), divided by n.
+    return ((n - 1) - (similarity_sum - self_similarity)) / n
+
+
+def mean_distances_chunked(X, metric, working_memory=None):
+    """Row means of pairwise_distances(X, metric=metric), computed a block
+    of rows at a time so only `working_memory` MiB of distances exist at once."""
+    means = [np.asarray(block.mean(axis=1)).ravel() for block in pairwise_distances_chunked(
+        X, metric=metric, working_memory=working_memory)]
+    return np.concatenate(means) if means else np.zeros(0)
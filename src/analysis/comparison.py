@@ -1,8 +1,57 @@
+from operator import itemgetter
+
 import pandas as pd
-from sentiment.analyzer import analyze_sentiment
-from nlp.translators import translate_to_english
 import numpy as np
 
+LABELS = ['POSITIVE', 'NEGATIVE', 'NEUTRAL']
+COMPARISON_COLUMNS = ['source', 'headline_id', 'original_sentiment', 'original_label', 'translated_sentiment',
+                      'translated_label', 'sentiment_shift', 'language']
+CATEGORICAL_COLUMNS = ['source', 'language', 'original_label', 'translated_label']
+
+
+def _as_category(values, categories=()):
+    if not isinstance(values, pd.Categorical):
+        # factorize on an object array skips pandas' string-array conversion
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        values = pd.Categorical.from_codes(codes, categories=pd.Index(uniques, dtype='str'))
+    missing = [c for c in categories if c not in values.categories]
+    return values.add_categories(missing) if missing else values
+
+
+def comparison_from_columns(source, original_sentiment, translated_sentiment, original_label=None,
+                            translated_label=None, language=None, headline_id=None):
+    """
+    Build the comparison dataframe from columnar input (equal-length arrays
+    or Series, one entry per headline).
+
+    Source, language and the labels are stored as categoricals, so the
+    frame stays small and groups quickly with millions of rows. Missing
+    `headline_id` numbers headlines 0.. within each source; a missing
+    language is 'unknown'.
+
+    Returns:
+    pd.DataFrame: Comparison dataframe with sentiment shifts
+    """
+    original = np.asarray(original_sentiment, dtype=np.float64)
+    translated = np.asarray(translated_sentiment, dtype=np.float64)
+    n = len(original)
+    source = _as_category(source)
+    if headline_id is None:
+        headline_id = pd.Series(source.codes).groupby(source.codes).cumcount().to_numpy()
+    frame = pd.DataFrame({
+        'source': source,
+        'headline_id': np.asarray(headline_id),
+        'original_sentiment': original,
+        'original_label': _as_category(original_label if original_label is not None else [None] * n, LABELS),
+        'translated_sentiment': translated,
+        'translated_label': _as_category(translated_label if translated_label is not None else [None] * n,
+                                         LABELS),
+        'sentiment_shift': translated - original,
+        'language': _as_category(language if language is not None else ['unknown'] * n),
+    })
+    return frame[COMPARISON_COLUMNS]
+
+
 def compare_sentiment(original_sentiment, translated_sentiment):
     """
     Compare sentiment across different languages and media sources.
@@ -14,26 +63,48 @@ def compare_sentiment(original_sentiment, translated_sentiment):
     Returns:
     pd.DataFrame: Comparison dataframe with sentiment shifts and bias metrics
     """
-    comparison_results = []
-    
+    columns = {name: [] for name in ('source', 'headline_id', 'original_sentiment', 'original_label',
+                                     'translated_sentiment', 'translated_label', 'language')}
+    sizes = []
     for source in original_sentiment.keys():
-        orig_scores = original_sentiment[source]
-        trans_scores = translated_sentiment[source]
-        
-        for idx, (orig, trans) in enumerate(zip(orig_scores, trans_scores)):
-            sentiment_shift = trans['score'] - orig['score']
-            comparison_results.append({
-                'source': source,
-                'headline_id': idx,
-                'original_sentiment': orig['score'],
-                'original_label': orig['label'],
-                'translated_sentiment': trans['score'],
-                'translated_label': trans['label'],
-                'sentiment_shift': sentiment_shift,
-                'language': orig.get('language', 'unknown')
-            })
-    
-    return pd.DataFrame(comparison_results)
+        n = min(len(original_sentiment[source]), len(translated_sentiment[source]))
+        orig, trans = original_sentiment[source][:n], translated_sentiment[source][:n]
+        sizes.append(n)
+        columns['headline_id'].extend(range(n))
+        columns['original_sentiment'].extend(map(itemgetter('score'), orig))
+        columns['original_label'].extend(map(itemgetter('label'), orig))
+        columns['translated_sentiment'].extend(map(itemgetter('score'), trans))
+        columns['translated_label'].extend(map(itemgetter('label'), trans))
+        columns['language'].extend([o.get('language', 'unknown') for o in orig])
+    columns['source'] = pd.Categorical.from_codes(np.repeat(np.arange(len(sizes)), sizes),
+                                                  categories=pd.Index(list(original_sentiment.keys())))
+    return comparison_from_columns(**columns)
+
+
+def source_bias_frame(comparison_df, by='source'):
+    """
+    Every bias metric per group in one grouped aggregation.
+
+    Parameters:
+    comparison_df (pd.DataFrame): Comparison dataframe
+    by (str or list): Grouping column(s), e.g. ['source', 'language']
+
+    Returns:
+    pd.DataFrame: One row per group, one column per metric
+    """
+    labels = comparison_df['translated_label']
+    frame = comparison_df.assign(
+        _positive=labels.eq('POSITIVE'), _negative=labels.eq('NEGATIVE'), _neutral=labels.eq('NEUTRAL'))
+    return frame.groupby(by, observed=True, sort=False).agg(
+        avg_original_sentiment=('original_sentiment', 'mean'),
+        avg_translated_sentiment=('translated_sentiment', 'mean'),
+        avg_sentiment_shift=('sentiment_shift', 'mean'),
+        std_deviation=('sentiment_shift', 'std'),
+        positive_count=('_positive', 'sum'),
+        negative_count=('_negative', 'sum'),
+        neutral_count=('_neutral', 'sum'),
+    )
+
 
 def calculate_source_bias(comparison_df):
     """
@@ -45,34 +116,18 @@ def calculate_source_bias(comparison_df):
     Returns:
     dict: Bias metrics per source
     """
-    bias_metrics = {}
-    
-    for source in comparison_df['source'].unique():
-        source_data = comparison_df[comparison_df['source'] == source]
-        
-        bias_metrics[source] = {
-            'avg_original_sentiment': source_data['original_sentiment'].mean(),
-            'avg_translated_sentiment': source_data['translated_sentiment'].mean(),
-            'avg_sentiment_shift': source_data['sentiment_shift'].mean(),
-            'std_deviation': source_data['sentiment_shift'].std(),
-            'positive_count': (source_data['translated_label'] == 'POSITIVE').sum(),
-            'negative_count': (source_data['translated_label'] == 'NEGATIVE').sum(),
-            'neutral_count': (source_data['translated_label'] == 'NEUTRAL').sum(),
-        }
-    
-    return bias_metrics
-
-def find_sentiment_divergence(comparison_df):
-    
-    divergence_threshold = 0.5
+    return source_bias_frame(comparison_df, 'source').to_dict('index')
+
+def find_sentiment_divergence(comparison_df, divergence_threshold=0.5):
+
     high_divergence = comparison_df[
         abs(comparison_df['sentiment_shift']) > divergence_threshold
     ].sort_values('sentiment_shift', ascending=False)
-    
+
     return high_divergence
 
 def visualize_sentiment_comparison(comparison_df, bias_metrics):
-    
+
     viz_data = {
         'comparison_df': comparison_df,
         'bias_metrics': bias_metrics,
@@ -80,7 +135,7 @@ def visualize_sentiment_comparison(comparison_df, bias_metrics):
         'avg_sentiments': [bias_metrics[s]['avg_translated_sentiment'] for s in bias_metrics.keys()],
         'sentiment_shifts': [bias_metrics[s]['avg_sentiment_shift'] for s in bias_metrics.keys()]
     }
-    
+
     return viz_data
 
 # Example usage
@@ -95,11 +150,11 @@ if __name__ == "__main__":
             {"text": "Sports victory celebrated", "score": 0.9, "label": "POSITIVE", "language": "en"}
         ]
     }
-    
+
     comparison = compare_sentiment(headlines, headlines)
     bias = calculate_source_bias(comparison)
     divergence = find_sentiment_divergence(comparison)
-    
+
     print(comparison)
     print("\nBias Metrics:")
-    print(bias)
\ No newline at end of file
+    print(bias)
@@ -0,0 +1,116 @@
+"""Compare the legacy row-by-row comparison functions with the vectorized ones.
+
+Usage (from src/):
+    python -m analysis.comparison_benchmark [--rows 1000000] [--sources 50]
+
+Synthetic scores are generated, so it runs offline. Each result is also
+checked against the legacy output.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from analysis.comparison import (CATEGORICAL_COLUMNS, LABELS, calculate_source_bias, compare_sentiment, comparison_from_columns,
+                                 source_bias_frame)
+
+
+def legacy_compare_sentiment(original_sentiment, translated_sentiment):
+    comparison_results = []
+    for source in original_sentiment.keys():
+        orig_scores = original_sentiment[source]
+        trans_scores = translated_sentiment[source]
+        for idx, (orig, trans) in enumerate(zip(orig_scores, trans_scores)):
+            comparison_results.append({
+                'source': source,
+                'headline_id': idx,
+                'original_sentiment': orig['score'],
+                'original_label': orig['label'],
+                'translated_sentiment': trans['score'],
+                'translated_label': trans['label'],
+                'sentiment_shift': trans['score'] - orig['score'],
+                'language': orig.get('language', 'unknown')
+            })
+    return pd.DataFrame(comparison_results)
+
+
+def legacy_calculate_source_bias(comparison_df):
+    bias_metrics = {}
+    for source in comparison_df['source'].unique():
+        source_data = comparison_df[comparison_df['source'] == source]
+        bias_metrics[source] = {
+            'avg_original_sentiment': source_data['original_sentiment'].mean(),
+            'avg_translated_sentiment': source_data['translated_sentiment'].mean(),
+            'avg_sentiment_shift': source_data['sentiment_shift'].mean(),
+            'std_deviation': source_data['sentiment_shift'].std(),
+            'positive_count': (source_data['translated_label'] == 'POSITIVE').sum(),
+            'negative_count': (source_data['translated_label'] == 'NEGATIVE').sum(),
+            'neutral_count': (source_data['translated_label'] == 'NEUTRAL').sum(),
+        }
+    return bias_metrics
+
+
+def synthetic_columns(rows, sources, seed=0):
+    rng = np.random.RandomState(seed)
+    return {
+        'source': np.array([f'source_{i}' for i in range(sources)])[rng.randint(0, sources, rows)],
+        'original_sentiment': rng.uniform(-1, 1, rows),
+        'original_label': np.array(LABELS)[rng.randint(0, 3, rows)],
+        'translated_sentiment': rng.uniform(-1, 1, rows),
+        'translated_label': np.array(LABELS)[rng.randint(0, 3, rows)],
+        'language': np.array(['en', 'hi', 'bn', 'ta', 'kn'])[rng.randint(0, 5, rows)],
+    }
+
+
+def as_nested(columns):
+    """The dict-of-lists-of-dicts shape compare_sentiment takes."""
+    original, translated = {}, {}
+    for s, os_, ol, ts, tl, lang in zip(*(columns[k] for k in ('source', 'original_sentiment', 'original_label',
+                                                               'translated_sentiment', 'translated_label',
+                                                               'language'))):
+        original.setdefault(s, []).append({'score': os_, 'label': ol, 'language': lang})
+        translated.setdefault(s, []).append({'score': ts, 'label': tl})
+    return original, translated
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def same_bias(a, b):
+    if list(a) != list(b):
+        return False
+    return all(np.isclose(a[s][k], b[s][k], equal_nan=True) for s in a for k in a[s])
+
+
+def run(rows, sources):
+    columns = synthetic_columns(rows, sources)
+    original, translated = as_nested(columns)
+
+    legacy_df, t_legacy_compare = timed(legacy_compare_sentiment, original, translated)
+    new_df, t_compare = timed(compare_sentiment, original, translated)
+    _, t_columns = timed(lambda: comparison_from_columns(**columns))
+    legacy_bias, t_legacy_bias = timed(legacy_calculate_source_bias, legacy_df)
+    new_bias, t_bias = timed(calculate_source_bias, new_df)
+    _, t_by_language = timed(source_bias_frame, new_df, ['source', 'language'])
+
+    frames_match = legacy_df.equals(new_df.astype({c: legacy_df[c].dtype for c in CATEGORICAL_COLUMNS}))
+    print(f"{rows} rows, {sources} sources")
+    print(f"compare_sentiment       legacy {t_legacy_compare:8.3f}s  new {t_compare:8.3f}s  "
+          f"(columnar input {t_columns:.3f}s)  same: {frames_match}")
+    print(f"calculate_source_bias   legacy {t_legacy_bias:8.3f}s  new {t_bias:8.3f}s  "
+          f"same: {same_bias(legacy_bias, new_bias)}")
+    print(f"bias by source+language            new {t_by_language:8.3f}s")
+    print(f"memory                  legacy {legacy_df.memory_usage(deep=True).sum() / 2**20:8.1f} MiB  "
+          f"new {new_df.memory_usage(deep=True).sum() / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the comparison engine against the legacy functions.')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--sources', type=int, default=50)
+    args = parser.parse_args()
+    run(args.rows, args.sources)
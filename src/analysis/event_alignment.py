@@ -0,0 +1,202 @@
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Prime just above 2**32; with a, b < 2**31 and 32-bit shingle hashes,
+# a * x + b stays inside uint64.
+_PRIME = np.uint64(4294967311)
+_PUNCT = re.compile(r'[^\w\s]+')
+
+
+def normalize_for_shingles(text):
+    text = unicodedata.normalize('NFC', text or '').casefold()
+    return ' '.join(_PUNCT.sub(' ', text).split())
+
+
+def shingle_hashes(text, size=4):
+    """CRC32 hashes of the distinct character `size`-grams of the normalized text."""
+    text = normalize_for_shingles(text)
+    if len(text) <= size:
+        grams = {text} if text else set()
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class EventIndex:
+    """Groups headlines about the same event, across outlets.
+
+    Each headline gets a MinHash signature of its character shingles
+    (`num_perm` hash functions). Signatures are split into `bands` bands and
+    every band is a bucket key in an LSH table, so a new headline is only
+    compared with headlines sharing at least one bucket instead of with
+    everything indexed. Candidates whose estimated Jaccard similarity is at
+    least `threshold` are merged into one event (union-find), so events grow
+    as headlines are added.
+    """
+
+    def __init__(self, num_perm=128, bands=32, threshold=0.5, shingle_size=4, seed=1):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31, size=num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, 2 ** 31, size=num_perm).astype(np.uint64)[:, None]
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        self._signatures = []
+        self._parent = []
+        self.items = []
+        self.comparisons = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def signature(self, text):
+        """MinHash signature of the text, or None when it has no shingles
+        (empty or punctuation-only)."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        return ((self._a * hashes[None, :] + self._b) % _PRIME).min(axis=1)
+
+    def _find(self, i):
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, i, j):
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            self._parent[max(ri, rj)] = min(ri, rj)
+
+    def similarity(self, i, j):
+        """Estimated Jaccard similarity of two indexed headlines."""
+        a, b = self._signatures[i], self._signatures[j]
+        if a is None or b is None:
+            return 0.0
+        return float(np.count_nonzero(a == b)) / self.num_perm
+
+    def add(self, text, source=None, **fields):
+        """Index one headline and link it to matching ones; returns its id.
+
+        `fields` (language, sentiment_score, link, ...) are kept for
+        to_frame(). A headline without shingles stays a one-item event.
+        """
+        item_id = len(self.items)
+        sig = self.signature(text)
+        self.items.append(dict(fields, text=text, source=source))
+        self._signatures.append(sig)
+        self._parent.append(item_id)
+        if sig is None:
+            return item_id
+
+        keys = [sig[b * self.rows:(b + 1) * self.rows].tobytes() for b in range(self.bands)]
+        candidates = set()
+        for bucket, key in zip(self._buckets, keys):
+            candidates.update(bucket.get(key, ()))
+        for other in candidates:
+            self.comparisons += 1
+            if self.similarity(item_id, other) >= self.threshold:
+                self._union(item_id, other)
+        for bucket, key in zip(self._buckets, keys):
+            bucket[key].append(item_id)
+        return item_id
+
+    def add_headlines(self, enriched, text_key='translated', translate=None):
+        """Index main.py-style {source: [headline dicts]}; returns the new ids.
+
+        Headlines are shingled on `text_key` (the English translation).
+        Non-English headlines without one, e.g. scored with --native-scoring,
+        are translated here in one batch with `translate(texts, 'en')`
+        (nlp.translators.translate_headlines by default), so they can match
+        coverage from the other outlets. If translation fails they are
+        shingled as written and only match coverage in the same language.
+        """
+        entries = [(source, item, item.get(text_key)) for source, items in enriched.items() for item in items]
+        missing = [i for i, (_, item, text) in enumerate(entries)
+                   if not text and item.get('headline') and item.get('language', 'en') not in (None, 'en')]
+        if missing:
+            try:
+                if translate is None:
+                    from nlp.translators import translate_headlines as translate
+                done = translate([entries[i][1]['headline'] for i in missing], 'en')
+                for i, text in zip(missing, done):
+                    entries[i] = entries[i][:2] + (text,)
+            except Exception as e:
+                print(f"[!] Translation for event alignment failed: {e}")
+
+        ids = []
+        for source, item, text in entries:
+            fields = {k: v for k, v in item.items() if k != 'source'}
+            if text:
+                fields[text_key] = text
+            ids.append(self.add(text or item.get('headline'), source=source, **fields))
+        return ids
+
+    def event_of(self, item_id):
+        return self._find(item_id)
+
+    def events(self, min_sources=1):
+        """Lists of item ids per event, keeping events covered by at least
+        `min_sources` distinct sources."""
+        groups = defaultdict(list)
+        for i in range(len(self.items)):
+            groups[self._find(i)].append(i)
+        return [ids for ids in groups.values()
+                if len({self.items[i]['source'] for i in ids}) >= min_sources]
+
+    def to_frame(self):
+        """One row per headline with its event_id."""
+        frame = pd.DataFrame(self.items)
+        frame.insert(0, 'event_id', [self._find(i) for i in range(len(self.items))])
+        frame.index.name = 'item_id'
+        if 'source' in frame:
+            frame['source'] = frame['source'].astype('category')
+        return frame
+
+    def compare_events(self, min_sources=2, value='sentiment_score'):
+        """Mean `value` per event and source, for events covered by at least
+        `min_sources` sources: one row per event, one column per source, plus
+        the event's headline count and its spread (max - min) across sources."""
+        frame = self.to_frame()
+        if frame.empty or value not in frame:
+            return pd.DataFrame()
+        n_sources = frame.groupby('event_id')['source'].nunique()
+        frame = frame[frame['event_id'].isin(n_sources.index[n_sources >= min_sources])]
+        table = frame.pivot_table(index='event_id', columns='source', values=value, aggfunc='mean',
+                                  observed=True)
+        table['headlines'] = frame.groupby('event_id').size()
+        table['spread'] = table.drop(columns='headlines').max(axis=1) - table.drop(columns='headlines').min(axis=1)
+        return table.sort_values('spread', ascending=False)
+
+
+# Example usage
+if __name__ == "__main__":
+    enriched = {
+        'times_of_india': [
+            {'headline': 'Bus accident on Mumbai-Pune expressway kills 12', 'sentiment_score': -0.9},
+            {'headline': 'India beat Australia to win the series', 'sentiment_score': 0.8},
+        ],
+        'ndtv': [
+            {'headline': '12 killed in bus accident on Mumbai-Pune Expressway', 'sentiment_score': -0.7},
+        ],
+        'vijaya_karnataka': [
+            {'headline': 'ಭಾರತಕ್ಕೆ ಸರಣಿ ಗೆಲುವು', 'translated': 'India beat Australia to win series',
+             'sentiment_score': 0.6},
+        ],
+    }
+    index = EventIndex()
+    index.add_headlines(enriched)
+    print(index.to_frame()[['event_id', 'source', 'text']])
+    print("\nPer-event sentiment by source:")
+    print(index.compare_events())
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+# metric -> (comparison_df column, null hypothesis). 'zero': the group mean
+# is 0 (paired shift, sign-flip test); 'rest': the group mean equals the
+# mean of every other headline (permutation test, approximated on large
+# corpora; see permutation_pvalue).
+METRICS = {
+    'avg_sentiment_shift': ('sentiment_shift', 'zero'),
+    'avg_translated_sentiment': ('translated_sentiment', 'rest'),
+    'avg_original_sentiment': ('original_sentiment', 'rest'),
+}
+
+# Upper bound on resample-matrix cells generated at once (~128 MiB of float64).
+MAX_CELLS = 2 ** 24
+# Above this many corpus-size x resamples cells, permutation tests sample
+# group subsets with replacement instead of shuffling the corpus per resample.
+EXACT_PERMUTATION_CELLS = 2 ** 20
+
+# Columns shared with process-pool workers, set once by _init_worker.
+_worker_columns = None
+
+
+def _init_worker(columns):
+    global _worker_columns
+    _worker_columns = columns
+
+
+def _row_chunks(n_resamples, width, max_cells=MAX_CELLS):
+    step = max(1, max_cells // max(width, 1))
+    for start in range(0, n_resamples, step):
+        yield start, min(step, n_resamples - start)
+
+
+def bootstrap_means(values, n_resamples, rng):
+    """Means of `n_resamples` bootstrap resamples, drawn as an index matrix."""
+    n = len(values)
+    means = np.empty(n_resamples)
+    for start, rows in _row_chunks(n_resamples, n):
+        means[start:start + rows] = values[rng.integers(0, n, size=(rows, n))].mean(axis=1)
+    return means
+
+
+def sign_flip_pvalue(values, n_resamples, rng):
+    """Two-sided p-value for mean(values) == 0 by random sign flips."""
+    n = len(values)
+    observed = abs(values.mean())
+    extreme = 0
+    for _, rows in _row_chunks(n_resamples, n):
+        signs = rng.integers(0, 2, size=(rows, n)) * 2 - 1
+        extreme += np.count_nonzero(np.abs((signs * values).mean(axis=1)) >= observed - 1e-12)
+    return (extreme + 1) / (n_resamples + 1)
+
+
+def permutation_pvalue(pooled, positions, n_resamples, rng):
+    """Two-sided p-value for the group at `positions` having the same mean
+    as the rest of `pooled`, by relabelling random subsets. Returns
+    (p_value, method), method being 'permutation' or 'permutation_approx'.
+
+    When len(pooled) * n_resamples is at most EXACT_PERMUTATION_CELLS each
+    resample is a full shuffle. Beyond that, subsets are drawn with replacement and their sums
+    shrunk by the finite-population correction sqrt((n - k) / (n - 1)), which
+    matches the permutation distribution's mean and variance at
+    O(n_resamples * group size) cost.
+    """
+    n, k = len(pooled), len(positions)
+    exact = n * n_resamples <= EXACT_PERMUTATION_CELLS
+    method = 'permutation' if exact else 'permutation_approx'
+    if k == n:
+        return 1.0, method
+    total = pooled.sum()
+    group_sum = pooled[positions].sum()
+    observed = abs(group_sum / k - (total - group_sum) / (n - k))
+    extreme = 0
+    if exact:
+        for _, rows in _row_chunks(n_resamples, n):
+            shuffled = rng.permuted(np.broadcast_to(pooled, (rows, n)), axis=1)
+            sums = shuffled[:, :k].sum(axis=1)
+            extreme += np.count_nonzero(np.abs(sums / k - (total - sums) / (n - k)) >= observed - 1e-12)
+    else:
+        expected = total * k / n
+        shrink = np.sqrt((n - k) / (n - 1))
+        for _, rows in _row_chunks(n_resamples, k):
+            sums = pooled[rng.integers(0, n, size=(rows, k))].sum(axis=1)
+            sums = expected + (sums - expected) * shrink
+            extreme += np.count_nonzero(np.abs(sums / k - (total - sums) / (n - k)) >= observed - 1e-12)
+    return (extreme + 1) / (n_resamples + 1), method
+
+
+def _group_stats(task):
+    key, positions, metrics, n_resamples, confidence, seed_seq = task
+    rows = []
+    for metric, rng in zip(metrics, (np.random.default_rng(s) for s in seed_seq.spawn(len(metrics)))):
+        column, null = METRICS[metric]
+        pooled = _worker_columns[column]
+        values = pooled[positions]
+        means = bootstrap_means(values, n_resamples, rng)
+        alpha = (1 - confidence) / 2
+        low, high = np.quantile(means, [alpha, 1 - alpha])
+        if null == 'zero':
+            p_value, method = sign_flip_pvalue(values, n_resamples, rng), 'sign_flip'
+        else:
+            p_value, method = permutation_pvalue(pooled, positions, n_resamples, rng)
+        rows.append({'group': key, 'metric': metric, 'n': len(values), 'estimate': values.mean(),
+                     'ci_low': low, 'ci_high': high, 'p_value': p_value, 'p_value_method': method})
+    return rows
+
+
+def bias_significance(comparison_df, by=('source', 'language'), metrics=('avg_sentiment_shift',
+                      'avg_translated_sentiment'), n_resamples=2000, confidence=0.95, seed=0, n_jobs=None):
+    """
+    Bootstrap confidence intervals and p-values for per-group bias metrics.
+
+    Parameters:
+    comparison_df (pd.DataFrame): Comparison dataframe (see analysis.comparison)
+    by (str or sequence): Grouping column(s)
+    metrics (sequence): Keys of METRICS
+    n_resamples (int): Bootstrap / permutation resamples per group and metric
+    confidence (float): Width of the percentile interval
+    seed (int): Makes results reproducible, independently of n_jobs
+    n_jobs (int): Worker processes; groups are spread over a process pool
+
+    Returns:
+    pd.DataFrame: One row per group and metric with n, estimate, ci_low,
+    ci_high, p_value and p_value_method. avg_sentiment_shift is tested
+    against zero by random sign flips ('sign_flip'). The average sentiments
+    are tested against all other headlines: by exact relabelling
+    ('permutation') while corpus rows x n_resamples is at most
+    EXACT_PERMUTATION_CELLS (about 524 rows at the default 2000 resamples),
+    and above that by resampling the group with replacement, corrected by
+    the finite-population factor ('permutation_approx'). The approximation
+    matches the permutation null's mean and variance, not its exact shape,
+    so treat p-values near the threshold with care.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    columns = {METRICS[m][0]: comparison_df[METRICS[m][0]].to_numpy(dtype=np.float64) for m in metrics}
+    groups = sorted(comparison_df.groupby(by, observed=True).indices.items())
+    seeds = np.random.SeedSequence(seed).spawn(len(groups))
+    tasks = [(key, positions, tuple(metrics), n_resamples, confidence, seed_seq)
+             for (key, positions), seed_seq in zip(groups, seeds)]
+
+    if n_jobs and n_jobs > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(columns,)) as pool:
+            results = list(pool.map(_group_stats, tasks))
+    else:
+        _init_worker(columns)
+        results = [_group_stats(task) for task in tasks]
+
+    frame = pd.DataFrame([row for rows in results for row in rows])
+    if frame.empty:
+        return pd.DataFrame(columns=by + ['metric', 'n', 'estimate', 'ci_low', 'ci_high', 'p_value',
+                                           'p_value_method'])
+    keys = pd.DataFrame([k if isinstance(k, tuple) else (k,) for k in frame.pop('group')], columns=by)
+    return pd.concat([keys, frame], axis=1)
@@ -0,0 +1,107 @@
+import hashlib
+import heapq
+import random
+import signal
+import threading
+import time
+from collections import OrderedDict
+
+
+class SeenHeadlines:
+    """Bounded LRU of (source, headline) keys already processed.
+
+    `retry` holds the sources whose last cycle failed after filtering, so
+    their feeds are re-parsed even if the HTTP cache reports no change.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self._keys = OrderedDict()
+        self.retry = set()
+
+    @staticmethod
+    def _key(source, headline):
+        return hashlib.sha1(f"{source}\x1f{' '.join((headline or '').split())}".encode('utf-8')).digest()
+
+    def filter_new(self, source, items):
+        """Return the items not seen before, without remembering them."""
+        new, keys = [], set()
+        for item in items:
+            key = self._key(source, item.get('headline'))
+            if key in self._keys:
+                self._keys.move_to_end(key)
+                continue
+            if key in keys:
+                continue
+            keys.add(key)
+            new.append(item)
+        return new
+
+    def mark(self, source, items):
+        """Remember `items` as processed, once their cycle has succeeded."""
+        for item in items:
+            key = self._key(source, item.get('headline'))
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+        while len(self._keys) > self.max_entries:
+            self._keys.popitem(last=False)
+
+
+class PollingDaemon:
+    """Runs `run_cycle(source_names)` for each source on its own cadence.
+
+    `intervals` maps source name -> seconds between polls. Each delay is
+    spread by +/- `jitter` (a fraction of the interval) so sources drift
+    apart instead of hitting the network in lockstep; sources that come due
+    together are handled in one cycle. The process stays up between cycles,
+    so loaded models, caches and HTTP sessions stay warm. SIGINT/SIGTERM
+    finish the current cycle and then stop.
+    """
+
+    def __init__(self, run_cycle, intervals, jitter=0.1, stop=None):
+        self.run_cycle = run_cycle
+        self.intervals = dict(intervals)
+        self.jitter = jitter
+        self.stop = stop or threading.Event()
+        self.cycles = 0
+
+    def _delay(self, source):
+        interval = self.intervals[source]
+        return max(1.0, interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def install_signal_handlers(self):
+        def _handle(signum, frame):
+            print(f"\n[*] Received signal {signum}, shutting down after the current cycle")
+            self.stop.set()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, _handle)
+
+    def run(self, max_cycles=None):
+        now = time.monotonic()
+        schedule = [(now, source) for source in self.intervals]
+        heapq.heapify(schedule)
+
+        while not self.stop.is_set() and schedule:
+            wait = schedule[0][0] - time.monotonic()
+            if wait > 0:
+                self.stop.wait(wait)
+                continue
+
+            now = time.monotonic()
+            due = []
+            while schedule and schedule[0][0] <= now:
+                due.append(heapq.heappop(schedule)[1])
+
+            started = time.perf_counter()
+            try:
+                self.run_cycle(due)
+            except Exception as e:
+                print(f"[!] Cycle for {', '.join(due)} failed: {e}")
+            self.cycles += 1
+            print(f"[*] Cycle {self.cycles} ({', '.join(due)}) took {time.perf_counter() - started:.2f}s")
+
+            for source in due:
+                heapq.heappush(schedule, (time.monotonic() + self._delay(source), source))
+            if max_cycles is not None and self.cycles >= max_cycles:
+                break
+        print('[*] Daemon stopped')
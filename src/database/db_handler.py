@@ -1,9 +1,35 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text
+import hashlib
+import unicodedata
+from datetime import datetime
+
+from sqlalchemy import create_engine, event, select, Column, DateTime, Float, Index, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from database.migrations import upgrade
+
 Base = declarative_base()
 
+# SQLite pragmas applied on every new connection: WAL lets readers run
+# alongside the ingest transaction and NORMAL sync avoids an fsync per commit.
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+)
+
+
+def normalize_headline(headline):
+    return ' '.join(unicodedata.normalize('NFC', headline or '').split()).casefold()
+
+
+def headline_hash(source, language, headline):
+    """Content hash used to deduplicate headlines across polls."""
+    key = '\x1f'.join((source or '', language or '', normalize_headline(headline)))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
 class NewsHeadline(Base):
     __tablename__ = 'news_headlines'
 
@@ -11,34 +37,182 @@ class NewsHeadline(Base):
     source = Column(String(50), nullable=False)
     language = Column(String(20), nullable=False)
     headline = Column(Text, nullable=False)
-    sentiment_score = Column(Integer)
+    translated_headline = Column(Text)
+    sentiment_score = Column(Float)
+    sentiment_label = Column(String(16))
+    confidence = Column(Float)
+    backend = Column(String(32))
+    model_version = Column(String(64))
+    # NULL for rows migrated from schemas that did not record it
+    scraped_at = Column(DateTime, default=datetime.utcnow)
+    content_hash = Column(String(64), unique=True, index=True)
+
+    __table_args__ = (
+        Index('ix_news_headlines_source_language_scraped_at', 'source', 'language', 'scraped_at'),
+        Index('ix_news_headlines_scraped_at', 'scraped_at'),
+    )
 
 class DatabaseHandler:
     def __init__(self, db_url='sqlite:///news_headlines.db'):
         self.engine = create_engine(db_url)
-        Base.metadata.create_all(self.engine)
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', _apply_sqlite_pragmas)
+        self.schema_version = upgrade(self.engine, Base.metadata)
         self.Session = sessionmaker(bind=self.engine)
 
-    def add_headline(self, source, language, headline, sentiment_score):
-        session = self.Session()
-        new_headline = NewsHeadline(source=source, language=language, headline=headline, sentiment_score=sentiment_score)
-        session.add(new_headline)
-        session.commit()
-        session.close()
+    def add_headline(self, source, language, headline, sentiment_score, **fields):
+        self.add_headlines([dict(fields, source=source, language=language, headline=headline,
+                                 sentiment_score=sentiment_score)])
 
-    def get_headlines(self, source=None, language=None):
-        session = self.Session()
-        query = session.query(NewsHeadline)
+    def add_headlines(self, headlines):
+        """Insert many headline dicts in a single transaction.
+
+        Each dict needs `source`, `language` and `headline`; `translated`,
+        `sentiment_score`, `sentiment_label`, `confidence`, `backend`,
+        `model_version` and `scraped_at` (default: now) are optional. Rows
+        whose content hash of (source, language, normalized headline) is
+        already stored, or repeated within the batch, are skipped.
+        Returns {'inserted': n, 'skipped': m}.
+        """
+        rows = []
+        seen = set()
+        total = 0
+        now = datetime.utcnow()
+        for h in headlines:
+            total += 1
+            digest = headline_hash(h['source'], h['language'], h['headline'])
+            if digest in seen:
+                continue
+            seen.add(digest)
+            rows.append({
+                'source': h['source'],
+                'language': h['language'],
+                'headline': h['headline'],
+                'translated_headline': h.get('translated', h.get('translated_headline')),
+                'sentiment_score': h.get('sentiment_score'),
+                'sentiment_label': h.get('sentiment_label'),
+                'confidence': h.get('confidence'),
+                'backend': h.get('backend'),
+                'model_version': h.get('model_version'),
+                'scraped_at': h.get('scraped_at') or now,
+                'content_hash': digest,
+            })
+        if not rows:
+            return {'inserted': 0, 'skipped': total}
+
+        table = NewsHeadline.__table__
+        with self.engine.begin() as conn:
+            dialect = self.engine.dialect.name
+            if dialect in ('sqlite', 'postgresql'):
+                if dialect == 'sqlite':
+                    from sqlalchemy.dialects.sqlite import insert
+                else:
+                    from sqlalchemy.dialects.postgresql import insert
+                stmt = insert(table).on_conflict_do_nothing(index_elements=['content_hash'])
+                inserted = conn.execute(stmt, rows).rowcount
+            else:
+                existing = set()
+                hashes = [r['content_hash'] for r in rows]
+                for start in range(0, len(hashes), 500):
+                    chunk = hashes[start:start + 500]
+                    existing.update(conn.execute(
+                        table.select().with_only_columns(table.c.content_hash)
+                        .where(table.c.content_hash.in_(chunk))).scalars())
+                rows = [r for r in rows if r['content_hash'] not in existing]
+                if rows:
+                    conn.execute(table.insert(), rows)
+                inserted = len(rows)
+        return {'inserted': inserted, 'skipped': total - inserted}
+
+    def _filtered(self, stmt, source=None, language=None, since=None, until=None):
         if source:
-            query = query.filter(NewsHeadline.source == source)
+            stmt = stmt.filter(NewsHeadline.source == source)
         if language:
-            query = query.filter(NewsHeadline.language == language)
+            stmt = stmt.filter(NewsHeadline.language == language)
+        if since is not None:
+            stmt = stmt.filter(NewsHeadline.scraped_at >= since)
+        if until is not None:
+            stmt = stmt.filter(NewsHeadline.scraped_at < until)
+        return stmt
+
+    def get_headlines(self, source=None, language=None, since=None, until=None):
+        """Headlines filtered by source/language and an optional scraped_at
+        window [since, until), served by the composite index."""
+        session = self.Session()
+        query = self._filtered(session.query(NewsHeadline), source, language, since, until)
+        if since is not None or until is not None:
+            query = query.order_by(NewsHeadline.scraped_at)
         results = query.all()
         session.close()
         return results
 
+    def iter_headlines(self, source=None, language=None, since=None, until=None, chunk_size=1000):
+        """Like get_headlines, but yields NewsHeadline objects while holding
+        at most `chunk_size` of them in memory (ORM yield_per over a
+        streaming cursor)."""
+        session = self.Session()
+        try:
+            query = self._filtered(session.query(NewsHeadline), source, language, since, until)
+            query = query.order_by(NewsHeadline.id).execution_options(stream_results=True)
+            for row in query.yield_per(chunk_size):
+                yield row
+        finally:
+            session.close()
+
+    def _columns(self, columns):
+        table = NewsHeadline.__table__
+        if columns is None:
+            return list(table.c)
+        return [table.c[name] for name in columns]
+
+    def read_frame(self, source=None, language=None, since=None, until=None, columns=None):
+        """Load matching rows straight into a pandas DataFrame through Core
+        SQL, without building ORM objects. `columns` limits what is read."""
+        import pandas as pd
+
+        stmt = self._filtered(select(*self._columns(columns)), source, language, since, until)
+        with self.engine.connect() as conn:
+            return pd.read_sql(stmt, conn)
+
+    def read_arrays(self, source=None, language=None, since=None, until=None, columns=None,
+                    chunk_size=50000):
+        """Load matching rows as a dict of column name -> NumPy array.
+
+        Rows are fetched from a streaming cursor `chunk_size` at a time and
+        transposed per chunk, so no per-row Python objects outlive a chunk.
+        """
+        import numpy as np
+
+        cols = self._columns(columns)
+        stmt = self._filtered(select(*cols), source, language, since, until)
+        parts = {c.name: [] for c in cols}
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(stmt)
+            for chunk in result.partitions(chunk_size):
+                for c, values in zip(cols, zip(*chunk)):
+                    parts[c.name].append(np.asarray(values, dtype=_numpy_dtype(c)))
+        return {c.name: np.concatenate(parts[c.name]) if parts[c.name] else np.array([], dtype=_numpy_dtype(c))
+                for c in cols}
+
     def clear_headlines(self):
         session = self.Session()
         session.query(NewsHeadline).delete()
         session.commit()
-        session.close()
\ No newline at end of file
+        session.close()
+
+
+def _numpy_dtype(column):
+    if isinstance(column.type, Float):
+        return 'float64'
+    if isinstance(column.type, Integer):
+        return 'int64'
+    if isinstance(column.type, DateTime):
+        return 'datetime64[us]'
+    return object
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
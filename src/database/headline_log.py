@@ -0,0 +1,168 @@
+import hashlib
+import json
+import mmap
+import os
+import time
+import uuid
+
+import numpy as np
+
+DEFAULT_LOG_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'raw', 'headlines.jsonl'))
+
+# One fixed-width record per log line. run_id is stored as the first 16
+# bytes of its md5, source as (at most) 24 bytes of UTF-8.
+INDEX_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('length', '<u4'),
+    ('timestamp', '<f8'),
+    ('run_id', 'S16'),
+    ('source', 'S24'),
+])
+
+
+def _run_key(run_id):
+    return hashlib.md5(str(run_id).encode('utf-8')).digest()
+
+
+def _source_key(source):
+    return (source or '').encode('utf-8')[:24]
+
+
+class HeadlineLog:
+    """Append-only JSON Lines log of raw scrape output.
+
+    Every line is indexed in a sidecar `<path>.idx` of INDEX_DTYPE records
+    (byte offset, length, timestamp, run id, source). Readers memory-map
+    both files, filter the index with NumPy and decode only the lines they
+    need, so neither reads nor appends touch the rest of the history.
+    """
+
+    def __init__(self, path=DEFAULT_LOG_PATH):
+        self.path = path
+        self.index_path = path + '.idx'
+
+    def append(self, records, source=None, run_id=None, timestamp=None):
+        """Append records (dicts) and index them; returns the run id.
+
+        `source` defaults to each record's own 'source' key. The log line is
+        written and flushed before its index entry, so a crash can leave an
+        unindexed tail line (see rebuild_index) but never a dangling entry.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        timestamp = time.time() if timestamp is None else timestamp
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        entries = []
+        with open(self.path, 'ab') as log:
+            offset = log.tell()
+            for record in records:
+                src = source or record.get('source')
+                line = json.dumps(dict(record, source=src, run_id=run_id, logged_at=timestamp),
+                                  ensure_ascii=False).encode('utf-8') + b'\n'
+                log.write(line)
+                entries.append((offset, len(line), timestamp, _run_key(run_id), _source_key(src)))
+                offset += len(line)
+            log.flush()
+            os.fsync(log.fileno())
+
+        if entries:
+            with open(self.index_path, 'ab') as idx:
+                np.array(entries, dtype=INDEX_DTYPE).tofile(idx)
+        return run_id
+
+    def index(self):
+        """Memory-mapped view of the index (empty array if there is none)."""
+        if not os.path.exists(self.index_path) or os.path.getsize(self.index_path) < INDEX_DTYPE.itemsize:
+            return np.zeros(0, dtype=INDEX_DTYPE)
+        count = os.path.getsize(self.index_path) // INDEX_DTYPE.itemsize
+        return np.memmap(self.index_path, dtype=INDEX_DTYPE, mode='r', shape=(count,))
+
+    def __len__(self):
+        return len(self.index())
+
+    def select(self, run_id=None, source=None, since=None, until=None):
+        """Positions of indexed records matching every given filter."""
+        idx = self.index()
+        mask = np.ones(len(idx), dtype=bool)
+        if run_id is not None:
+            mask &= idx['run_id'] == _run_key(run_id)
+        if source is not None:
+            mask &= idx['source'] == _source_key(source)
+        if since is not None:
+            mask &= idx['timestamp'] >= since
+        if until is not None:
+            mask &= idx['timestamp'] < until
+        return np.nonzero(mask)[0]
+
+    def read(self, positions):
+        """Decode the records at the given index positions, in that order."""
+        idx = self.index()
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return []
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log:
+            out = []
+            for pos in positions:
+                entry = idx[pos]
+                start = int(entry['offset'])
+                out.append(json.loads(log[start:start + int(entry['length'])]))
+            return out
+
+    def records(self, run_id=None, source=None, since=None, until=None):
+        return self.read(self.select(run_id, source, since, until))
+
+    def tail(self, n=20):
+        total = len(self)
+        return self.read(range(max(0, total - n), total))
+
+    def follow(self, start=None, poll_interval=1.0, stop=None):
+        """Yield (position, record) for records appended after `start`.
+
+        `start` defaults to the current end of the log, i.e. only new
+        records. Polls the index every `poll_interval` seconds until the
+        optional `stop` threading.Event is set. Persist the last position
+        to resume later without rereading history.
+        """
+        position = len(self) if start is None else start
+        while stop is None or not stop.is_set():
+            total = len(self)
+            if total > position:
+                for offset, record in enumerate(self.read(range(position, total))):
+                    yield position + offset, record
+                position = total
+                continue
+            if stop is not None:
+                stop.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+
+    def rebuild_index(self):
+        """Regenerate the sidecar index by scanning the log once."""
+        entries = []
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as log:
+                offset = 0
+                for line in log:
+                    if line.endswith(b'\n'):
+                        record = json.loads(line)
+                        entries.append((offset, len(line), record.get('logged_at') or 0.0,
+                                        _run_key(record.get('run_id')), _source_key(record.get('source'))))
+                    offset += len(line)
+        tmp = self.index_path + '.tmp'
+        np.array(entries, dtype=INDEX_DTYPE).tofile(tmp)
+        os.replace(tmp, self.index_path)
+        return len(entries)
+
+    def import_snapshot(self, json_path, run_id=None, timestamp=None):
+        """Append a legacy `{source: {'items': [...]}}` JSON dump such as
+        reports/raw_headlines.json as one run."""
+        with open(json_path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        run_id = run_id or uuid.uuid4().hex
+        if timestamp is None:
+            timestamp = os.path.getmtime(json_path)
+        for source, payload in snapshot.items():
+            items = payload.get('items', []) if isinstance(payload, dict) else payload
+            self.append(items, source=source, run_id=run_id, timestamp=timestamp)
+        return run_id
@@ -0,0 +1,107 @@
+from sqlalchemy import inspect, text
+
+# Schema history of news_headlines:
+#   1 - original table (id, source, language, headline, integer sentiment_score)
+#   2 - content_hash column with a unique index for deduplicated ingest
+#   3 - float sentiment_score, translated_headline, sentiment_label, confidence,
+#       backend, model_version, scraped_at and time-window indexes
+SCHEMA_VERSION = 3
+
+_V3_COLUMNS = (
+    ('translated_headline', 'TEXT'),
+    ('sentiment_label', 'VARCHAR(16)'),
+    ('confidence', 'FLOAT'),
+    ('backend', 'VARCHAR(32)'),
+    ('model_version', 'VARCHAR(64)'),
+    ('scraped_at', 'TIMESTAMP'),
+)
+
+
+def current_version(conn):
+    """Stored schema version, inferred from the columns for databases that
+    predate the schema_version table; None for an empty database."""
+    insp = inspect(conn)
+    tables = insp.get_table_names()
+    if 'schema_version' in tables:
+        version = conn.execute(text('SELECT MAX(version) FROM schema_version')).scalar()
+        if version is not None:
+            return version
+    if 'news_headlines' not in tables:
+        return None
+    columns = {c['name'] for c in insp.get_columns('news_headlines')}
+    if 'scraped_at' in columns:
+        return 3
+    return 2 if 'content_hash' in columns else 1
+
+
+def _stamp(conn, version):
+    conn.execute(text('CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)'))
+    conn.execute(text('DELETE FROM schema_version'))
+    conn.execute(text('INSERT INTO schema_version (version) VALUES (:v)'), {'v': version})
+
+
+def _to_v2(conn, metadata):
+    from database.db_handler import headline_hash
+
+    conn.execute(text('ALTER TABLE news_headlines ADD COLUMN content_hash VARCHAR(64)'))
+    # backfill; later copies of an already-seen headline keep a NULL hash
+    seen = set()
+    updates = []
+    for row_id, source, language, headline in conn.execute(
+            text('SELECT id, source, language, headline FROM news_headlines ORDER BY id')):
+        digest = headline_hash(source, language, headline)
+        if digest not in seen:
+            seen.add(digest)
+            updates.append({'id': row_id, 'h': digest})
+    if updates:
+        conn.execute(text('UPDATE news_headlines SET content_hash = :h WHERE id = :id'), updates)
+    conn.execute(text('CREATE UNIQUE INDEX ix_news_headlines_content_hash ON news_headlines (content_hash)'))
+
+
+def _to_v3(conn, metadata):
+    table = metadata.tables['news_headlines']
+    if conn.dialect.name == 'sqlite':
+        # SQLite cannot change a column type in place: rebuild the table.
+        for index in inspect(conn).get_indexes('news_headlines'):
+            conn.execute(text(f'DROP INDEX IF EXISTS "{index["name"]}"'))
+        conn.execute(text('ALTER TABLE news_headlines RENAME TO news_headlines_v2'))
+        metadata.create_all(conn, tables=[table])
+        conn.execute(text(
+            'INSERT INTO news_headlines (id, source, language, headline, sentiment_score, content_hash) '
+            'SELECT id, source, language, headline, CAST(sentiment_score AS REAL), content_hash '
+            'FROM news_headlines_v2'))
+        conn.execute(text('DROP TABLE news_headlines_v2'))
+        return
+
+    for name, sql_type in _V3_COLUMNS:
+        conn.execute(text(f'ALTER TABLE news_headlines ADD COLUMN {name} {sql_type}'))
+    conn.execute(text('ALTER TABLE news_headlines ALTER COLUMN sentiment_score TYPE DOUBLE PRECISION'))
+    for index in table.indexes:
+        if index.name != 'ix_news_headlines_content_hash':
+            index.create(conn)
+
+
+MIGRATIONS = (
+    (2, _to_v2),
+    (3, _to_v3),
+)
+
+
+def upgrade(engine, metadata):
+    """Bring the database to SCHEMA_VERSION in one transaction.
+
+    Fresh databases are created at the latest version directly; older ones
+    run every pending step in order. Returns the resulting version.
+    """
+    with engine.begin() as conn:
+        version = current_version(conn)
+        if version is None:
+            metadata.create_all(conn)
+            version = SCHEMA_VERSION
+        for target, step in MIGRATIONS:
+            if version < target:
+                print(f"[*] Migrating news_headlines schema v{version} -> v{target}")
+                step(conn, metadata)
+                version = target
+        _stamp(conn, version)
+    return version
@@ -0,0 +1,137 @@
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DEFAULT_ARCHIVE_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'processed', 'headlines'))
+
+PARTITION_COLUMNS = ['date', 'source', 'language']
+# Low-cardinality columns are stored dictionary-encoded and load as categoricals.
+CATEGORICAL_COLUMNS = ['sentiment_label', 'backend']
+
+_category = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema([
+    ('date', pa.string()),
+    ('source', pa.string()),
+    ('language', pa.string()),
+    ('run_id', pa.string()),
+    ('scraped_at', pa.timestamp('us', tz='UTC')),
+    ('headline', pa.string()),
+    ('translated', pa.string()),
+    ('link', pa.string()),
+    ('sentiment_score', pa.float64()),
+    ('sentiment_label', _category),
+    ('confidence', pa.float64()),
+    ('backend', _category),
+])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor='hive')
+
+
+def _as_date_str(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).date().isoformat() if value.tzinfo else value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class HeadlineArchive:
+    """Append-only Parquet archive of scored headlines.
+
+    Files are laid out as `<root>/date=YYYY-MM-DD/source=<s>/language=<l>/
+    <run_id>-<n>.parquet`, so loads filtered on date, source or language only
+    open the matching directories.
+    """
+
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR):
+        self.root = root
+
+    def append(self, records, run_id=None, scraped_at=None):
+        """Write one run's enriched headline dicts; returns the run id.
+
+        Each record needs `source`, `language` and `headline`; the other
+        SCHEMA columns are optional. `scraped_at` defaults to now (UTC).
+        """
+        records = list(records)
+        if not records:
+            return None
+        run_id = run_id or uuid.uuid4().hex
+        scraped_at = scraped_at or datetime.now(timezone.utc)
+
+        columns = {name: [] for name in SCHEMA.names}
+        for r in records:
+            ts = r.get('scraped_at') or scraped_at
+            row = dict(r, run_id=run_id, scraped_at=ts, date=_as_date_str(ts))
+            for name in SCHEMA.names:
+                columns[name].append(row.get(name))
+        table = pa.table(columns, schema=SCHEMA)
+
+        os.makedirs(self.root, exist_ok=True)
+        pq.write_to_dataset(
+            table, self.root,
+            partitioning=PARTITIONING,
+            basename_template=f'{run_id}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            use_dictionary=CATEGORICAL_COLUMNS + ['headline', 'translated'],
+        )
+        return run_id
+
+    def _dataset(self):
+        return ds.dataset(self.root, format='parquet', partitioning=PARTITIONING)
+
+    def _filter(self, start_date=None, end_date=None, sources=None, languages=None, last_days=None,
+                extra=None):
+        if last_days is not None:
+            start_date = datetime.now(timezone.utc).date() - timedelta(days=last_days - 1)
+        conditions = []
+        if start_date is not None:
+            conditions.append(ds.field('date') >= _as_date_str(start_date))
+        if end_date is not None:
+            conditions.append(ds.field('date') <= _as_date_str(end_date))
+        if sources:
+            conditions.append(ds.field('source').isin(list(sources)))
+        if languages:
+            conditions.append(ds.field('language').isin(list(languages)))
+        if extra is not None:
+            conditions.append(extra)
+        expr = None
+        for cond in conditions:
+            expr = cond if expr is None else expr & cond
+        return expr
+
+    def load(self, columns=None, start_date=None, end_date=None, sources=None, languages=None,
+             last_days=None, filter=None):
+        """Load archived headlines as a DataFrame.
+
+        `columns` projects the read to just those columns. Date bounds
+        (inclusive), `last_days`, `sources` and `languages` prune partitions
+        before any file is opened; `filter` is an extra pyarrow expression
+        pushed down to the row-group statistics, e.g.
+        `ds.field('sentiment_score') < 0`.
+        """
+        if not os.path.isdir(self.root):
+            import pandas as pd
+            return pd.DataFrame(columns=columns or SCHEMA.names)
+
+        expr = self._filter(start_date, end_date, sources, languages, last_days, filter)
+        frame = self._dataset().to_table(columns=columns, filter=expr).to_pandas()
+        for name in ('source', 'language'):
+            if name in frame.columns:
+                frame[name] = frame[name].astype('category')
+        return frame
+
+    def files(self, start_date=None, end_date=None, sources=None, languages=None, last_days=None):
+        """Paths of the Parquet files a load with the same arguments reads."""
+        if not os.path.isdir(self.root):
+            return []
+        expr = self._filter(start_date, end_date, sources, languages, last_days)
+        return [f.path for f in self._dataset().get_fragments(filter=expr)]
@@ -12,7 +12,7 @@ try:
 except Exception:
     from sklearn.externals.joblib import dump, load
 
-from sentiment.models import SentimentModel, load_data
+from sentiment.models import IncrementalSentimentModel, SentimentModel, load_data
 
 
 def compute_metrics(y_true, y_pred):
@@ -43,7 +43,14 @@ def main():
     parser.add_argument('--model-out', help='Path to save trained model (joblib)', required=False)
     parser.add_argument('--model-in', help='Path to load existing model (joblib)', required=False)
     parser.add_argument('--report-out', help='Directory to save evaluation report', default='../reports')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Stream --train-csv in chunks into an IncrementalSentimentModel '
+                             '(continues training a loaded incremental model)')
+    parser.add_argument('--compiled-out', help='Also export the model as NumPy arrays for sentiment.compiled')
+    parser.add_argument('--chunksize', type=int, default=100000, help='Rows per chunk with --incremental')
     args = parser.parse_args()
+    if args.incremental and args.compiled_out:
+        parser.error('--compiled-out only supports the TF-IDF SentimentModel, not --incremental')
 
     # ensure report dir
     report_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), args.report_out))
@@ -53,6 +60,8 @@ def main():
     if args.model_in and os.path.exists(args.model_in):
         print('[*] Loading model from', args.model_in)
         model = load(args.model_in)
+        if args.compiled_out and isinstance(model, IncrementalSentimentModel):
+            parser.error('--compiled-out only supports the TF-IDF SentimentModel, not an incremental model')
 
     # Load data
     if args.test_csv and os.path.exists(args.test_csv):
@@ -66,6 +75,13 @@ def main():
         print('Provide `--test-csv path/to/labeled.csv` with columns `headline` and `sentiment`.')
         return
 
+    # Warm start: keep training an incremental model on new labeled data
+    if args.incremental and args.train_csv and os.path.exists(args.train_csv):
+        if not isinstance(model, IncrementalSentimentModel):
+            model = IncrementalSentimentModel()
+        print('[*] Training incremental model from', args.train_csv)
+        model.fit_csv(args.train_csv, chunksize=args.chunksize)
+
     # If no model available, try to train one
     if model is None:
         if args.train_csv and os.path.exists(args.train_csv):
@@ -91,6 +107,10 @@ def main():
             os.makedirs(out_dir, exist_ok=True)
         dump(model, args.model_out)
         print('[*] Saved model to', args.model_out)
+    if args.compiled_out:
+        from sentiment.compiled import export_model
+        export_model(model, args.compiled_out)
+        print('[*] Saved compiled model to', args.compiled_out)
 
     # Run predictions on df_test
     headlines = df_test['headline'].fillna('').astype(str).tolist()
@@ -1,7 +1,9 @@
 import sys
 import os
+import argparse
 import importlib
 import html
+import uuid
 from datetime import datetime
 
 sys.stdout.reconfigure(encoding='utf-8')
@@ -10,6 +12,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # ---------------- CONFIG ----------------
 MAX_HEADLINES_PER_SOURCE = 5
 SHOW_NEUTRAL = True
+SCRAPE_DEADLINE_SECONDS = 15.0
+ARCHIVE_RESULTS = True  # append each run to the Parquet archive under data/processed
+LOG_RAW_HEADLINES = True  # append raw scrape output to data/raw/headlines.jsonl
+NATIVE_SCORING = False  # score hi/bn/ta/kn headlines with native-script lexicons instead of translating (--native-scoring)
 # ----------------------------------------
 
 # ---------------- HELPERS ----------------
@@ -46,14 +52,16 @@ def simple_emotion(score):
         return "Very Happy"
 
 # ---------------- SCRAPER HANDLER ----------------
+LANG_MAP = {
+    'times_of_india': 'en',
+    'ndtv': 'en',
+    'vijaya_karnataka': 'kn',
+    'dinamani': 'ta'
+}
+
 def try_scrape(module_name, candidates):
     """Try multiple scraping functions in a module."""
-    lang_map = {
-        'times_of_india': 'en',
-        'ndtv': 'en',
-        'vijaya_karnataka': 'kn',
-        'dinamani': 'ta'
-    }
+    lang_map = LANG_MAP
 
     try:
         mod = importlib.import_module(f"scrapers.{module_name}")
@@ -96,8 +104,11 @@ def normalize_scraper_output(out, default_lang='en'):
     return results
 
 # ---------------- LOAD TRANSLATION & SENTIMENT ----------------
-from nlp.translators import translate_text, detect_language
-from sentiment.analyzer import analyze_headlines
+from nlp.language_detector import detect_languages
+from nlp.translators import translate_headlines
+from scrapers.fetcher import scrape_all
+from sentiment.analyzer import NATIVE_LANGUAGE_BACKENDS, analyze_headlines, warm_up
+from daemon import PollingDaemon, SeenHeadlines
 
 # ---------------- SOURCES ----------------
 sources = [
@@ -107,66 +118,220 @@ sources = [
     ('dinamani', ['scrape_dinamani', 'scrape_dinamani_headlines'])
 ]
 
+# Daemon mode: seconds between polls per source
+POLL_INTERVALS = {
+    'times_of_india': 300,
+    'ndtv': 300,
+    'vijaya_karnataka': 600,
+    'dinamani': 600
+}
+
+_raw_log = None
+
+def get_raw_log():
+    global _raw_log
+    if _raw_log is None:
+        from database.headline_log import HeadlineLog
+        _raw_log = HeadlineLog()
+    return _raw_log
+
 # ---------------- SCRAPE ----------------
-headlines = {}
-for name, candidates in sources:
-    items = try_scrape(name, candidates)
-    if not items:
-        print(f"[!] No headlines from {name}")
-        continue
-    # Filter valid headlines
-    filtered = [h for h in items if is_valid_headline(h['headline'])]
-    headlines[name] = filtered[:20]
+def scrape_sources(names, run_id, skip_unchanged=False, force=()):
+    """Fetch the given sources in parallel.
+
+    Returns ({source: valid headline dicts}, failed), where `failed` is the
+    set of sources whose fetch timed out or raised. A timed-out fetch can
+    still finish in the background and update the HTTP cache, so the
+    caller has to force those sources on the next poll.
+    """
+    # All sources are fetched in parallel; anything slower than the deadline is skipped.
+    scraped, timings = scrape_all(names, deadline=SCRAPE_DEADLINE_SECONDS, skip_unchanged=skip_unchanged,
+                                  force=force)
+    for name, t in timings.items():
+        if t['status'] == 'ok':
+            print(f"[*] {name}: fetch {t['fetch_seconds']:.2f}s, parse {t['parse_seconds']:.3f}s, {t['items']} items")
+        elif t['status'] == 'not_modified':
+            print(f"[*] {name}: unchanged since last fetch")
+        else:
+            print(f"[!] {name}: {t['status']} {t.get('error', '')}".rstrip())
+
+    candidates_by_name = dict(sources)
+    headlines = {}
+    for name in names:
+        if timings.get(name, {}).get('status') == 'not_modified':
+            continue
+        if name in scraped:
+            items = normalize_scraper_output(scraped[name], LANG_MAP.get(name, 'en'))
+        elif timings.get(name, {}).get('status') == 'unsupported':
+            items = try_scrape(name, candidates_by_name.get(name, []))
+        else:
+            items = []
+        if not items:
+            print(f"[!] No headlines from {name}")
+            continue
+        if LOG_RAW_HEADLINES:
+            get_raw_log().append(items, source=name, run_id=run_id)
+        # Filter valid headlines
+        filtered = [h for h in items if is_valid_headline(h['headline'])]
+        headlines[name] = filtered[:20]
+    failed = {name for name in names
+              if timings.get(name, {}).get('status') not in ('ok', 'not_modified', 'unsupported')}
+    return headlines, failed
 
 # ---------------- SENTIMENT ----------------
-enriched = {}
-for src, items in headlines.items():
-    prepared = []
-    for it in items:
-        text = it['headline']
-        lang = it.get('language') or detect_language(text)
-        if lang != 'en':
+def enrich(headlines):
+    """Translate non-English headlines and score them; return {source: enriched dicts}.
+
+    With NATIVE_SCORING, headlines in a language that has a native lexicon
+    are scored as written and keep `translated` as None.
+    """
+    language_backends = NATIVE_LANGUAGE_BACKENDS if NATIVE_SCORING else None
+    enriched = {}
+    for src, items in headlines.items():
+        texts = [it['headline'] for it in items]
+        # Local script detection: text that is already English skips translation.
+        scripts = detect_languages(texts)
+        langs = ['en' if script == 'en' else (it.get('language') or script)
+                 for it, script in zip(items, scripts)]
+        native = [bool(language_backends) and lang in language_backends for lang in langs]
+        pending = [i for i, lang in enumerate(langs) if lang != 'en' and not native[i]]
+        translated = [None if is_native else t for t, is_native in zip(texts, native)]
+        if pending:
             try:
-                translated = translate_text(text, 'en')
+                done = translate_headlines([texts[i] for i in pending], 'en')
             except Exception:
-                translated = text
-        else:
-            translated = text
-        prepared.append({'headline': text, 'translated': translated})
-
-    if not prepared:
-        continue
-
-    analyzed = analyze_headlines([{'headline': p['translated'], 'language': 'en'} for p in prepared])
-    merged = []
-    for p, a in zip(prepared, analyzed):
-        merged.append({
-            'headline': p['headline'],
-            'translated': p['translated'],
-            'sentiment_score': a.get('sentiment_score', 0.0)
-        })
-    enriched[src] = merged
+                done = [texts[i] for i in pending]
+            for i, t in zip(pending, done):
+                translated[i] = t
+        prepared = [{'headline': h, 'translated': t, 'language': it.get('language'), 'link': it.get('link')}
+                    for it, h, t in zip(items, texts, translated)]
 
-# ---------------- OUTPUT ----------------
-print("\n" + "="*80)
-print("SCRAPED HEADLINES WITH EMOTION")
-print("="*80 + "\n")
-
-for source, items in enriched.items():
-    print(f"--- {source.upper()} ---\n")
-    count = 0
-    for item in items:
-        score = item['sentiment_score']
-        emotion = simple_emotion(score)
-        if not SHOW_NEUTRAL and emotion == "Neutral":
+        if not prepared:
             continue
-        print(f"Headline: {item['headline']}")
-        if item['translated'] != item['headline']:
-            print(f"(Translated) {item['translated']}")
-        print(f"Emotion: {emotion} (Score: {score:+.2f})\n")
-        count += 1
-        if count >= MAX_HEADLINES_PER_SOURCE:
-            break
-    print()
-
-print(f"Report generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+        analyzed = analyze_headlines(
+            [{'headline': p['translated'] or p['headline'], 'language': lang if is_native else 'en'}
+             for p, lang, is_native in zip(prepared, langs, native)],
+            language_backends=language_backends)
+        merged = []
+        for p, a in zip(prepared, analyzed):
+            merged.append({
+                'headline': p['headline'],
+                'translated': p['translated'],
+                'language': p['language'],
+                'link': p['link'],
+                'sentiment_score': a.get('sentiment_score', 0.0),
+                'sentiment_label': a.get('sentiment_label'),
+                'confidence': a.get('confidence'),
+                'backend': a.get('backend')
+            })
+        enriched[src] = merged
+    return enriched
+
+# ---------------- ARCHIVE ----------------
+def archive(enriched, run_id):
+    """Append the run to the Parquet archive; returns False if that failed."""
+    if not (ARCHIVE_RESULTS and enriched):
+        return True
+    try:
+        from database.parquet_archive import HeadlineArchive
+        HeadlineArchive().append(
+            (dict(item, source=src) for src, items in enriched.items() for item in items), run_id=run_id)
+        print(f"[*] Archived run {run_id} to data/processed")
+        return True
+    except Exception as e:
+        print(f"[!] Archiving failed: {e}")
+        return False
+
+def run_cycle(names, skip_unchanged=False, seen=None):
+    """One scrape -> translate -> score -> archive pass over `names`.
+
+    With `seen`, headlines already processed in earlier cycles are dropped
+    before translation and scoring. New headlines are only marked as seen
+    once they have been scored and archived. Sources whose fetch failed,
+    and every source of a cycle that raised or could not archive, are
+    re-parsed in full on their next poll, even when their feeds report no
+    change.
+    """
+    run_id = uuid.uuid4().hex
+    force = seen.retry.intersection(names) if seen is not None else ()
+    headlines, failed = scrape_sources(names, run_id, skip_unchanged=skip_unchanged, force=force)
+    if seen is not None:
+        headlines = {src: new for src, items in headlines.items()
+                     for new in [seen.filter_new(src, items)] if new}
+        for src in names:
+            print(f"[*] {src}: {len(headlines.get(src, []))} new headlines")
+    try:
+        enriched = enrich(headlines)
+        archived = archive(enriched, run_id)
+    except Exception:
+        if seen is not None:
+            seen.retry.update(names)
+        raise
+    if seen is not None:
+        if not archived:
+            seen.retry.update(names)
+            return enriched
+        for src, items in headlines.items():
+            seen.mark(src, items)
+        seen.retry.difference_update(set(names) - failed)
+        seen.retry.update(failed)
+    return enriched
+
+# ---------------- OUTPUT ----------------
+def print_report(enriched):
+    print("\n" + "="*80)
+    print("SCRAPED HEADLINES WITH EMOTION")
+    print("="*80 + "\n")
+
+    for source, items in enriched.items():
+        print(f"--- {source.upper()} ---\n")
+        count = 0
+        for item in items:
+            score = item['sentiment_score']
+            emotion = simple_emotion(score)
+            if not SHOW_NEUTRAL and emotion == "Neutral":
+                continue
+            print(f"Headline: {item['headline']}")
+            if item['translated'] and item['translated'] != item['headline']:
+                print(f"(Translated) {item['translated']}")
+            print(f"Emotion: {emotion} (Score: {score:+.2f})\n")
+            count += 1
+            if count >= MAX_HEADLINES_PER_SOURCE:
+                break
+        print()
+
+    print(f"Report generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+# ---------------- ENTRY POINT ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scrape, translate and score news headlines.')
+    parser.add_argument('--daemon', action='store_true', help='Keep running and poll each source on its own interval')
+    parser.add_argument('--interval', type=float, help='Poll interval in seconds for every source (daemon mode)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Random spread of each poll interval, as a fraction')
+    parser.add_argument('--native-scoring', action='store_true',
+                        help='Score hi/bn/ta/kn headlines with native-script lexicons, without translating them')
+    args = parser.parse_args(argv)
+
+    global NATIVE_SCORING
+    NATIVE_SCORING = NATIVE_SCORING or args.native_scoring
+    # Load the sentiment backend once; every analyze_headlines call reuses it.
+    warm_up()
+    if NATIVE_SCORING:
+        warm_up('native')
+    names = [name for name, _ in sources]
+
+    if not args.daemon:
+        print_report(run_cycle(names))
+        return
+
+    intervals = {name: args.interval or POLL_INTERVALS.get(name, 300) for name in names}
+    seen = SeenHeadlines()
+    daemon = PollingDaemon(lambda due: run_cycle(due, skip_unchanged=True, seen=seen), intervals, jitter=args.jitter)
+    daemon.install_signal_handlers()
+    print(f"[*] Polling {', '.join(f'{n} every {i:.0f}s' for n, i in intervals.items())}")
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+
+UNDETERMINED = 'und'
+
+# Unicode blocks -> language code. Latin covers ASCII letters plus the
+# Latin-1 supplement and Latin Extended-A/B ranges.
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, 'en'),
+    (0x0061, 0x007A, 'en'),
+    (0x00C0, 0x024F, 'en'),
+    (0x0900, 0x097F, 'hi'),  # Devanagari
+    (0x0980, 0x09FF, 'bn'),  # Bengali
+    (0x0B80, 0x0BFF, 'ta'),  # Tamil
+    (0x0C80, 0x0CFF, 'kn'),  # Kannada
+]
+LANGUAGES = ('en', 'hi', 'bn', 'ta', 'kn')
+
+# Frequent character n-grams, used only to break ties between scripts.
+NGRAM_PROFILES = {
+    'en': {'the', 'ing', 'and', 'ion', 'ent', 'for', 'tio', ' to', 'ed ', 'er '},
+    'hi': {'के', 'में', 'की', 'है', 'से', 'ने', 'को', 'का', 'ें ', 'ों'},
+    'bn': {'ের', 'কে', 'না', 'য়', 'ার', 'তে', 'র ', 'বা', 'েক', 'লে'},
+    'ta': {'கள', 'ில', 'ின', 'க்', 'ம்', 'ட்', 'த்', 'ப்', 'ன்', 'ல்'},
+    'kn': {'ದ ', 'ಲ್ಲ', 'ಗೆ', 'ನ ', 'ರು', 'ಳು', 'ಯ ', 'ಕ್', 'ತ್', 'ರ್'},
+}
+
+_starts = np.array([r[0] for r in SCRIPT_RANGES], dtype=np.uint32)
+_ends = np.array([r[1] for r in SCRIPT_RANGES], dtype=np.uint32)
+_range_lang = np.array([LANGUAGES.index(r[2]) for r in SCRIPT_RANGES], dtype=np.int64)
+
+
+def script_histograms(texts):
+    """Return an (n_texts x len(LANGUAGES)) matrix of per-script letter counts.
+
+    The whole batch is encoded once as UTF-32 and bucketed with a single
+    searchsorted, so cost is one vectorized pass over all code points.
+    """
+    n = len(texts)
+    if n == 0:
+        return np.zeros((0, len(LANGUAGES)), dtype=np.int64)
+    joined = '\x00'.join((t or '').replace('\x00', '') for t in texts)
+    cps = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32)
+    row = np.cumsum(cps == 0)
+    idx = np.searchsorted(_starts, cps, side='right') - 1
+    valid = (idx >= 0) & (cps <= _ends[np.clip(idx, 0, None)])
+    flat = row[valid] * len(LANGUAGES) + _range_lang[idx[valid]]
+    counts = np.bincount(flat, minlength=n * len(LANGUAGES))
+    return counts.reshape(n, len(LANGUAGES))
+
+
+def _ngram_score(text, lang):
+    low = text.lower()
+    return sum(low.count(g) for g in NGRAM_PROFILES.get(lang, ()))
+
+
+def detect_languages(texts, use_ngrams=True, tie_margin=0.0):
+    """Classify each text by its dominant Unicode script.
+
+    Returns a language code from LANGUAGES per text, or 'und' when the text
+    has no letters from a known script. When the top two scripts are within
+    `tie_margin` (fraction of the top count) and `use_ngrams` is set,
+    character n-gram profiles decide between them.
+    """
+    texts = list(texts)
+    hist = script_histograms(texts)
+    if not len(texts):
+        return []
+    order = np.argsort(-hist, axis=1, kind='stable')
+    top = order[:, 0]
+    top_count = hist[np.arange(len(texts)), top]
+    second_count = hist[np.arange(len(texts)), order[:, 1]]
+
+    labels = np.array(LANGUAGES, dtype=object)[top]
+    labels[top_count == 0] = UNDETERMINED
+
+    if use_ngrams:
+        tied = np.nonzero((top_count > 0) & (second_count > 0) &
+                          (top_count - second_count <= tie_margin * top_count))[0]
+        for i in tied:
+            candidates = [LANGUAGES[j] for j in order[i] if hist[i, j] >= second_count[i]]
+            labels[i] = max(candidates, key=lambda lang: _ngram_score(texts[i], lang))
+    return labels.tolist()
+
+
+def detect_language(text, use_ngrams=True):
+    """Single-text convenience wrapper around detect_languages."""
+    return detect_languages([text], use_ngrams=use_ngrams)[0]
+
+
+def is_english(texts):
+    """Boolean mask of texts whose dominant script is Latin."""
+    return [lang == 'en' for lang in detect_languages(texts)]
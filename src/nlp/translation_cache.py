@@ -0,0 +1,175 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'cache', 'translations.sqlite'))
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 4096
+DEFAULT_DISK_ENTRIES = 200000
+
+
+def normalize_text(text):
+    """NFC-normalize, collapse whitespace and strip, so trivially different
+    copies of the same headline share a cache entry."""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+def cache_key(text, source_language, target_language):
+    """Content-addressed key: (normalized text hash, source, target)."""
+    digest = hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+    return f"{digest}:{source_language or 'auto'}:{target_language}"
+
+
+class TranslationCache:
+    """Two-tier translation cache: an in-memory LRU in front of SQLite.
+
+    Entries expire after `ttl_seconds`. The memory tier holds at most
+    `max_memory_entries`; the disk tier is trimmed to `max_disk_entries`
+    by least-recent access. Pass `path=None` for a memory-only cache.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_memory_entries=DEFAULT_MEMORY_ENTRIES, max_disk_entries=DEFAULT_DISK_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts_since_trim = 0
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self._conn = self._open(path) if path else None
+
+    def _open(self, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS translations ('
+                ' key TEXT PRIMARY KEY, translated TEXT NOT NULL,'
+                ' created_at REAL NOT NULL, accessed_at REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_translations_accessed ON translations (accessed_at)')
+            conn.commit()
+            return conn
+        except Exception as e:
+            print(f"[!] Translation cache disk tier disabled ({path}): {e}")
+            return None
+
+    def _expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _remember(self, key, translated, created_at):
+        self._memory[key] = (translated, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def get(self, text, source_language, target_language):
+        """Return the cached translation, or None on a miss."""
+        key = cache_key(text, source_language, target_language)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return entry[0]
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    'SELECT translated, created_at FROM translations WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    if not self._expired(row[1], now):
+                        self._conn.execute('UPDATE translations SET accessed_at = ? WHERE key = ?', (now, key))
+                        self._conn.commit()
+                        self._remember(key, row[0], row[1])
+                        self.counters['disk_hits'] += 1
+                        return row[0]
+                    self._conn.execute('DELETE FROM translations WHERE key = ?', (key,))
+                    self._conn.commit()
+
+            self.counters['misses'] += 1
+            return None
+
+    def put(self, text, source_language, target_language, translated):
+        key = cache_key(text, source_language, target_language)
+        now = time.time()
+        with self._lock:
+            self._remember(key, translated, now)
+            self.counters['writes'] += 1
+            if self._conn is not None:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO translations (key, translated, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    (key, translated, now, now))
+                self._conn.commit()
+                self._puts_since_trim += 1
+                if self._puts_since_trim >= 256:
+                    self._trim_disk(now)
+
+    def _trim_disk(self, now):
+        self._puts_since_trim = 0
+        if self.ttl_seconds is not None:
+            self._conn.execute('DELETE FROM translations WHERE created_at < ?', (now - self.ttl_seconds,))
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._conn.execute(
+                'DELETE FROM translations WHERE key IN '
+                '(SELECT key FROM translations ORDER BY accessed_at LIMIT ?)', (excess,))
+            self.counters['evictions'] += excess
+        self._conn.commit()
+
+    def stats(self):
+        """Hit/miss counters plus the current size of each tier."""
+        with self._lock:
+            out = dict(self.counters)
+            out['memory_entries'] = len(self._memory)
+            if self._conn is not None:
+                out['disk_entries'] = self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+        lookups = out['memory_hits'] + out['disk_hits'] + out['misses']
+        out['hit_rate'] = (out['memory_hits'] + out['disk_hits']) / lookups if lookups else 0.0
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute('DELETE FROM translations')
+                self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_UNSET = object()
+_default_cache = _UNSET
+_default_cache_lock = threading.Lock()
+
+
+def get_translation_cache():
+    """Process-wide cache used by nlp.translators (None if disabled)."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is _UNSET:
+            _default_cache = TranslationCache(os.environ.get('TRANSLATION_CACHE_PATH', DEFAULT_CACHE_PATH))
+        return _default_cache
+
+
+def set_translation_cache(cache):
+    """Replace the process-wide cache (None disables caching)."""
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
@@ -0,0 +1,203 @@
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from nlp.translation_cache import cache_key, get_translation_cache
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_RETRIES = 3
+
+
+class GoogleTranslateClient:
+    """One googletrans Translator shared by every request of the engine."""
+
+    def __init__(self):
+        self._translator = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        with self._lock:
+            if self._translator is None:
+                from googletrans import Translator
+                self._translator = Translator()
+            return self._translator
+
+    def translate(self, text, target_language, source_language='auto'):
+        return self._get().translate(text, src=source_language or 'auto', dest=target_language).text
+
+
+class StubTranslator:
+    """Offline stand-in for GoogleTranslateClient.
+
+    Sleeps `latency` seconds per call to mimic a network round-trip and
+    fails a `fail_rate` fraction of calls, so concurrency, coalescing and
+    retries can be exercised and measured without network access.
+    """
+
+    def __init__(self, latency=0.0, fail_rate=0.0, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def translate(self, text, target_language, source_language='auto'):
+        with self._lock:
+            self.calls += 1
+            fail = self._rng.random() < self.fail_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise ConnectionError('stub translator: simulated failure')
+        return f'[{target_language}] {text}'
+
+
+class TranslationEngine:
+    """Thread-pool translation engine.
+
+    At most `max_workers` remote calls run at once over a single client.
+    Concurrent requests for the same (text, source, target) share one
+    in-flight call, cached translations skip the pool entirely, and failed
+    calls are retried with exponential backoff and full jitter. If every
+    attempt fails the original text is returned, as translate_text does.
+    """
+
+    def __init__(self, client=None, max_workers=DEFAULT_MAX_WORKERS, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_base=0.5, backoff_max=8.0, cache=None, use_default_cache=True):
+        self.client = client or GoogleTranslateClient()
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._cache = cache
+        self._use_default_cache = use_default_cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate')
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.counters = {'requests': 0, 'cache_hits': 0, 'coalesced': 0,
+                         'remote_calls': 0, 'retries': 0, 'failures': 0}
+
+    @property
+    def cache(self):
+        if self._cache is not None:
+            return self._cache
+        return get_translation_cache() if self._use_default_cache else None
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def _call_with_retry(self, text, target_language, source_language, cache):
+        for attempt in range(self.max_retries + 1):
+            self._count('remote_calls')
+            try:
+                translated = self.client.translate(text, target_language, source_language)
+            except Exception:
+                if attempt == self.max_retries:
+                    self._count('failures')
+                    return text
+                self._count('retries')
+                time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+                continue
+            if cache is not None:
+                cache.put(text, source_language, target_language, translated)
+            return translated
+
+    def submit(self, text, target_language, source_language='auto', use_cache=True):
+        """Schedule a translation and return a Future for the translated text."""
+        self._count('requests')
+        if not text:
+            future = Future()
+            future.set_result(text)
+            return future
+
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(text, source_language, target_language)
+            if cached is not None:
+                self._count('cache_hits')
+                future = Future()
+                future.set_result(cached)
+                return future
+
+        key = cache_key(text, source_language, target_language)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.counters['coalesced'] += 1
+                return future
+            future = self._executor.submit(self._call_with_retry, text, target_language, source_language, cache)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _f, key=key: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def translate(self, text, target_language, source_language='auto', use_cache=True):
+        return self.submit(text, target_language, source_language, use_cache).result()
+
+    def translate_many(self, texts, target_language, source_language='auto'):
+        """Translate a list concurrently, preserving input order."""
+        futures = [self.submit(t, target_language, source_language) for t in texts]
+        return [f.result() for f in futures]
+
+    def translate_matrix(self, texts, target_languages, source_language='auto'):
+        """Translate every text into every target language in one fan-out."""
+        futures = {lang: [self.submit(t, lang, source_language) for t in texts] for lang in target_languages}
+        return {lang: [f.result() for f in fs] for lang, fs in futures.items()}
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def get_translation_engine():
+    """Process-wide engine used by nlp.translators."""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = TranslationEngine()
+        return _default_engine
+
+
+def set_translation_engine(engine):
+    """Replace the process-wide engine, e.g. with one built on StubTranslator."""
+    global _default_engine
+    with _default_engine_lock:
+        _default_engine = engine
+
+
+def measure_throughput(engine, texts, target_languages):
+    """Run translate_matrix once and return translations/sec."""
+    started = time.perf_counter()
+    engine.translate_matrix(texts, target_languages)
+    elapsed = time.perf_counter() - started
+    total = len(texts) * len(target_languages)
+    return total / elapsed if elapsed > 0 else float('inf')
+
+
+# Example usage (from src/): python -m nlp.translation_engine
+if __name__ == "__main__":
+    texts = [f"headline number {i % 150}" for i in range(200)]
+    languages = ['en', 'hi', 'bn', 'kn']
+    for workers in (1, 8, 32):
+        stub = StubTranslator(latency=0.02, fail_rate=0.05, seed=0)
+        with TranslationEngine(stub, max_workers=workers, backoff_base=0.01, use_default_cache=False) as engine:
+            rate = measure_throughput(engine, texts, languages)
+            print(f"workers={workers:>2}  {rate:8.1f} translations/sec  {engine.stats()}  stub calls={stub.calls}")
@@ -1,34 +1,26 @@
-def translate_text(text, target_language):
-    try:
-        from googletrans import Translator
-        translator = Translator()
-        res = translator.translate(text, dest=target_language)
-        return res.text
-    except Exception:
-        # fallback: return original text if translation fails
-        return text
-
-def translate_headlines(headlines, target_language):
-    translated_headlines = []
-    for headline in headlines:
-        translated_headline = translate_text(headline, target_language)
-        translated_headlines.append(translated_headline)
-    return translated_headlines
+from nlp.language_detector import detect_language as detect_script_language
+from nlp.translation_engine import get_translation_engine
+
+TARGET_LANGUAGES = ['en', 'hi', 'bn', 'kn']  # English, Hindi, Bengali, Kannada
+
+
+def translate_text(text, target_language, source_language='auto', use_cache=True):
+    """Translate `text`, serving repeats from the translation cache.
+
+    Failed translations are not cached; the original text is returned.
+    """
+    return get_translation_engine().translate(text, target_language, source_language, use_cache)
+
+def translate_headlines(headlines, target_language, source_language='auto'):
+    """Translate a list of headlines concurrently, preserving order."""
+    return get_translation_engine().translate_many(headlines, target_language, source_language)
 
 def detect_language(text):
-    try:
-        from googletrans import Translator
-        translator = Translator()
-        res = translator.detect(text)
-        return res.lang
-    except Exception:
-        return 'en'
-
-def translate_to_all_languages(headlines):
-    languages = ['en', 'hi', 'bn', 'kn']  # English, Hindi, Bengali, Kannada
-    translated_results = {}
-    
-    for lang in languages:
-        translated_results[lang] = translate_headlines(headlines, lang)
-    
-    return translated_results
\ No newline at end of file
+    """Detect the language offline from the text's Unicode script.
+
+    Returns 'und' instead of guessing 'en' when no known script is present.
+    """
+    return detect_script_language(text)
+
+def translate_to_all_languages(headlines, source_language='auto'):
+    return get_translation_engine().translate_matrix(headlines, TARGET_LANGUAGES, source_language)
@@ -1,16 +1,18 @@
 import requests
-from bs4 import BeautifulSoup
 
-def scrape_dinamani_headlines():
-    url = 'https://www.dinamani.com/'
+from scrapers.parsing import restricted_soup
+
+URL = 'https://www.dinamani.com/'
+LANGUAGE = 'ta'
+
+def fetch(session=None, url=URL, timeout=10):
     headers = {'User-Agent': 'Mozilla/5.0'}
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-    except Exception:
-        return []
+    response = (session or requests).get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response.content
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+def parse(content):
+    soup = restricted_soup(content, ['h2', 'h3', 'a'])
     headlines = []
 
     for tag in soup.find_all(['h2', 'h3', 'a']):
@@ -33,7 +35,14 @@ def scrape_dinamani_headlines():
 
     return out[:20]
 
+def scrape_dinamani_headlines(session=None):
+    try:
+        content = fetch(session)
+    except Exception:
+        return []
+    return parse(content)
+
 
 if __name__ == "__main__":
     for h in scrape_dinamani_headlines():
-        print(h)
\ No newline at end of file
+        print(h)
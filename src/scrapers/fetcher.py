@@ -0,0 +1,104 @@
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_DEADLINE_SECONDS = 15.0
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name):
+    """Return the keep-alive session for a source, creating it on first use.
+
+    Sessions live for the whole process, so repeated runs (and the polling
+    daemon) reuse pooled connections instead of redoing TCP/TLS handshakes.
+    """
+    with _sessions_lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'User-Agent': 'Mozilla/5.0'})
+            _sessions[name] = session
+        return session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _scrape_one(name, url, timeout, deadline_at, skip_unchanged, force):
+    timing = {'status': 'ok', 'fetch_seconds': None, 'parse_seconds': None, 'items': 0}
+    mod = importlib.import_module(f"scrapers.{name}")
+    if not (hasattr(mod, 'fetch') and hasattr(mod, 'parse')):
+        timing['status'] = 'unsupported'
+        return None, timing
+
+    # never let a single request outlive the run deadline
+    timeout = max(0.1, min(timeout, deadline_at - time.monotonic()))
+    started = time.perf_counter()
+    if hasattr(mod, 'fetch_conditional'):
+        content, changed = mod.fetch_conditional(session=get_session(name), url=url or mod.URL, timeout=timeout)
+    else:
+        content, changed = mod.fetch(session=get_session(name), url=url or mod.URL, timeout=timeout), True
+    timing['fetch_seconds'] = time.perf_counter() - started
+    if skip_unchanged and not changed and name not in force:
+        timing['status'] = 'not_modified'
+        return None, timing
+
+    started = time.perf_counter()
+    items = mod.parse(content)
+    timing['parse_seconds'] = time.perf_counter() - started
+    timing['items'] = len(items)
+    return items, timing
+
+
+def scrape_all(names, deadline=DEFAULT_DEADLINE_SECONDS, timeout=DEFAULT_REQUEST_TIMEOUT, urls=None,
+               skip_unchanged=False, force=()):
+    """Run every scraper in parallel and return (results, timings).
+
+    `results` maps source name -> parsed items for the scrapers that finished
+    before `deadline` seconds; slower sources are reported with status
+    'timeout' in `timings` and left out. `urls` overrides the feed URL per
+    source, e.g. to point the scrapers at a local fixture server.
+
+    Scrapers with a `fetch_conditional` revalidate against the HTTP cache;
+    with `skip_unchanged`, a feed that has not changed since the last fetch
+    is reported as 'not_modified' and neither parsed nor returned, except
+    for the sources in `force`, which are parsed from the cached body.
+    """
+    urls = urls or {}
+    deadline_at = time.monotonic() + deadline
+    executor = ThreadPoolExecutor(max_workers=max(1, len(names)), thread_name_prefix='scrape')
+    futures = {executor.submit(_scrape_one, name, urls.get(name), timeout, deadline_at, skip_unchanged,
+                               frozenset(force)): name
+               for name in names}
+    done, _ = wait(futures, timeout=deadline)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results, timings = {}, {}
+    for future, name in futures.items():
+        if future not in done:
+            timings[name] = {'status': 'timeout', 'fetch_seconds': None, 'parse_seconds': None, 'items': 0}
+            continue
+        try:
+            items, timing = future.result()
+        except Exception as e:
+            timings[name] = {'status': 'error', 'error': str(e), 'fetch_seconds': None,
+                             'parse_seconds': None, 'items': 0}
+            continue
+        timings[name] = timing
+        if items is not None:
+            results[name] = items
+    return results, timings
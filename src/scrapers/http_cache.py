@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+DEFAULT_CACHE_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'cache', 'http'))
+
+
+class HttpCache:
+    """On-disk store of response bodies and their ETag/Last-Modified validators.
+
+    Each URL maps to `<sha1(url)>.body` and `<sha1(url)>.json` under
+    `cache_dir`; both are written via a temp file and os.replace so a crash
+    never leaves a half-written entry.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _base(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def lookup(self, url):
+        """Return {'etag', 'last_modified', 'sha256', 'body', ...} or None."""
+        base = self._base(url)
+        try:
+            with open(base + '.json', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(base + '.body', 'rb') as f:
+                meta['body'] = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def store(self, url, body, etag=None, last_modified=None, digest=None):
+        base = self._base(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': digest or hashlib.sha256(body).hexdigest(),
+            'stored_at': time.time(),
+        }
+        _atomic_write(base + '.body', body)
+        _atomic_write(base + '.json', json.dumps(meta).encode('utf-8'))
+
+
+def _atomic_write(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def conditional_get(url, session=None, timeout=10, headers=None, cache=None):
+    """GET `url` with If-None-Match/If-Modified-Since from the cached entry.
+
+    Returns (body, changed). On a 304 the cached body is returned with
+    changed=False; a 200 whose body hashes the same as the cached one is
+    also reported as unchanged, so callers can skip parsing either way.
+    """
+    cache = cache or get_http_cache()
+    entry = cache.lookup(url)
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+
+    response = (session or requests).get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and entry:
+        return entry['body'], False
+    response.raise_for_status()
+
+    body = response.content
+    digest = hashlib.sha256(body).hexdigest()
+    changed = entry is None or entry.get('sha256') != digest
+    cache.store(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'), digest)
+    return body, changed
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Process-wide HttpCache under data/cache/http."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache(os.environ.get('HTTP_CACHE_DIR', DEFAULT_CACHE_DIR))
+        return _default_cache
@@ -0,0 +1,91 @@
+"""Compare the legacy full-document parsers against the streaming/restricted ones.
+
+Usage (from src/):
+    python -m scrapers.parse_benchmark [--rss saved_feed.xml] [--html saved_page.html]
+
+Without arguments synthetic pages are generated, so it runs offline.
+"""
+import argparse
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from bs4 import BeautifulSoup
+
+from scrapers import dinamani, ndtv
+
+
+def legacy_parse_rss(content):
+    headlines = []
+    root = ET.fromstring(content)
+    for item in root.findall('.//item')[:20]:
+        headlines.append({'headline': item.find('title').text, 'link': item.find('link').text})
+    return headlines
+
+
+def legacy_parse_html(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    out = []
+    for tag in soup.find_all(['h2', 'h3', 'a']):
+        text = tag.get_text(strip=True)
+        if text and len(text) >= 8:
+            out.append(text)
+    return out[:20]
+
+
+def synthetic_rss(items=5000):
+    body = ''.join(
+        f'<item><title>Headline number {i} about the news</title><link>https://example.com/{i}</link>'
+        f'<description>{"lorem ipsum " * 40}</description></item>'
+        for i in range(items))
+    return f'<?xml version="1.0"?><rss><channel><title>feed</title>{body}</channel></rss>'.encode('utf-8')
+
+
+def synthetic_html(blocks=3000):
+    body = ''.join(
+        f'<div class="card"><p>{"ಸುದ್ದಿ ವಿವರ " * 20}</p><h2><a href="/n/{i}">ಮುಖ್ಯ ಸುದ್ದಿ ಸಂಖ್ಯೆ {i}</a></h2>'
+        f'<span>meta</span><img src="/i/{i}.jpg"></div>'
+        for i in range(blocks))
+    return f'<html><head><title>x</title></head><body>{body}</body></html>'.encode('utf-8')
+
+
+def measure(fn, content, repeat=5):
+    """Return (best seconds, peak traced bytes) for fn(content)."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(content)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(rss_content, html_content, repeat=5):
+    rows = [
+        ('rss', 'legacy fromstring', legacy_parse_rss, rss_content),
+        ('rss', 'iterparse', ndtv.parse, rss_content),
+        ('html', 'legacy html.parser', legacy_parse_html, html_content),
+        ('html', 'restricted', dinamani.parse, html_content),
+    ]
+    results = []
+    for kind, name, fn, content in rows:
+        seconds, peak = measure(fn, content, repeat)
+        results.append({'kind': kind, 'parser': name, 'ms': seconds * 1000, 'peak_kb': peak / 1024,
+                        'bytes': len(content)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark scraper parse paths on saved pages.')
+    parser.add_argument('--rss', help='Saved RSS feed')
+    parser.add_argument('--html', help='Saved HTML page')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rss_content = open(args.rss, 'rb').read() if args.rss else synthetic_rss()
+    html_content = open(args.html, 'rb').read() if args.html else synthetic_html()
+    for r in run(rss_content, html_content, args.repeat):
+        print(f"{r['kind']:<5} {r['parser']:<20} {r['ms']:9.2f} ms  peak {r['peak_kb']:10.1f} KiB  ({r['bytes']} bytes)")
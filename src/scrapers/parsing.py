@@ -0,0 +1,44 @@
+import io
+import xml.etree.ElementTree as ET
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+def iter_rss_items(content, limit=20):
+    """Yield (title, link) for the first `limit` <item>s of an RSS document.
+
+    Uses incremental iterparse and stops reading once the cap is reached,
+    clearing each item after use so memory stays flat however long the
+    feed is.
+    """
+    if limit <= 0:
+        return
+    count = 0
+    for _, elem in ET.iterparse(io.BytesIO(content), events=('end',)):
+        if elem.tag != 'item':
+            continue
+        title = elem.find('title')
+        link = elem.find('link')
+        yield (title.text if title is not None else None,
+               link.text if link is not None else None)
+        elem.clear()
+        count += 1
+        if count >= limit:
+            return
+
+
+def html_parser_backend():
+    """'lxml' when it is installed (several times faster), else 'html.parser'."""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+_PARSER_BACKEND = html_parser_backend()
+
+
+def restricted_soup(content, tags, parser=None):
+    """Parse only the given tags (and their subtrees) instead of the whole page."""
+    return BeautifulSoup(content, parser or _PARSER_BACKEND, parse_only=SoupStrainer(tags))
@@ -1,24 +1,33 @@
-import requests
-import xml.etree.ElementTree as ET
+from scrapers.http_cache import conditional_get
+from scrapers.parsing import iter_rss_items
 
-def scrape_times_of_india():
-    url = "https://timesofindia.indiatimes.com/rssfeedstopstories.cms"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except Exception as e:
-        print("TOI RSS request failed:", e)
-        return []
+URL = "https://timesofindia.indiatimes.com/rssfeedstopstories.cms"
+LANGUAGE = 'en'
+
+def fetch_conditional(session=None, url=URL, timeout=10):
+    """Return (content, changed), revalidating against the on-disk HTTP cache."""
+    return conditional_get(url, session=session, timeout=timeout)
+
+def fetch(session=None, url=URL, timeout=10):
+    return fetch_conditional(session, url, timeout)[0]
 
+def parse(content):
     headlines = []
-    root = ET.fromstring(response.content)
-    for item in root.findall('.//item')[:20]:
-        title = item.find('title').text
-        link = item.find('link').text
+    for title, link in iter_rss_items(content, limit=20):
         headlines.append({'Headline': title, 'Link': link, 'Language': 'en'})
 
     return headlines
 
+def scrape_times_of_india(session=None, only_if_changed=False):
+    try:
+        content, changed = fetch_conditional(session)
+    except Exception as e:
+        print("TOI RSS request failed:", e)
+        return []
+    if only_if_changed and not changed:
+        return []
+    return parse(content)
+
 if __name__ == "__main__":
     for h in scrape_times_of_india():
         print(h)
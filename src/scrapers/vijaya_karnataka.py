@@ -1,20 +1,20 @@
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
-def scrape_vijaya_karnataka():
-    url = "https://vijaykarnataka.indiatimes.com/"
+from scrapers.parsing import restricted_soup
+
+URL = "https://vijaykarnataka.indiatimes.com/"
+LANGUAGE = 'kn'
+
+def fetch(session=None, url=URL, timeout=10):
     headers = {'User-Agent': 'Mozilla/5.0'}
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        response.encoding = 'utf-8'  # Ensure UTF-8 decoding
-    except Exception as e:
-        print("Request failed:", e)
-        return []
+    response = (session or requests).get(url, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response.content
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+def parse(content, base_url=URL):
+    # Ensure UTF-8 decoding
+    soup = restricted_soup(content.decode('utf-8', errors='replace'), 'a')
     headlines = []
     seen = set()
 
@@ -24,7 +24,7 @@ def scrape_vijaya_karnataka():
         if not text or len(text) < 15:
             continue
 
-        link = urljoin(url, a['href'])
+        link = urljoin(base_url, a['href'])
 
         if text not in seen:
             seen.add(text)
@@ -39,6 +39,14 @@ def scrape_vijaya_karnataka():
 
     return headlines
 
+def scrape_vijaya_karnataka(session=None):
+    try:
+        content = fetch(session)
+    except Exception as e:
+        print("Request failed:", e)
+        return []
+    return parse(content)
+
 
 if __name__ == "__main__":
     for h in scrape_vijaya_karnataka():
@@ -0,0 +1,274 @@
+import math
+import threading
+from collections import Counter
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+LABELS = ('positive', 'negative', 'neutral')
+
+
+def normalize_label(label):
+    """Labels are counted casefolded, so analyze_headlines' 'POSITIVE' and
+    SentimentAnalyzer's 'positive' land in the same bucket."""
+    return label.casefold() if isinstance(label, str) else label
+
+
+class RunningStats:
+    """Count, mean and variance of a stream of scores (Welford), plus label
+    counts (casefolded, see normalize_label). update() is O(1); merge()
+    combines states built separately (other buckets, other workers)
+    exactly (Chan et al.)."""
+
+    __slots__ = ('count', 'n', 'mean', 'm2', 'labels')
+
+    def __init__(self):
+        self.count = 0       # headlines seen
+        self.n = 0           # headlines that came with a score
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.labels = Counter()
+
+    def update(self, value=None, label=None):
+        self.count += 1
+        if label is not None:
+            self.labels[normalize_label(label)] += 1
+        if value is not None:
+            self.n += 1
+            delta = value - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (value - self.mean)
+        return self
+
+    @classmethod
+    def from_values(cls, values=None, labels=None):
+        """State of a whole batch at once (NumPy for the scores)."""
+        stats = cls()
+        if labels is not None:
+            raw = Counter(labels)
+            stats.count = sum(raw.values())
+            for label, n in raw.items():
+                if label is not None:
+                    stats.labels[normalize_label(label)] += n
+        if values is not None:
+            values = np.asarray(values, dtype=np.float64)
+            stats.n = len(values)
+            stats.count = max(stats.count, stats.n)
+            if stats.n:
+                stats.mean = float(values.mean())
+                stats.m2 = float(((values - stats.mean) ** 2).sum())
+        return stats
+
+    def merge(self, other):
+        """Fold `other` into this state in place; returns self."""
+        self.count += other.count
+        self.labels.update(other.labels)
+        if other.n:
+            n = self.n + other.n
+            delta = other.mean - self.mean
+            self.mean += delta * other.n / n
+            self.m2 += other.m2 + delta * delta * self.n * other.n / n
+            self.n = n
+        return self
+
+    def copy(self):
+        return RunningStats().merge(self)
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1, as pandas' std), NaN below two scores."""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.n > 1 else math.nan
+
+    def label_counts(self, labels=LABELS):
+        return {label: self.labels.get(label, 0) for label in labels}
+
+    def to_dict(self):
+        return dict(count=self.count, n=self.n, mean=self.mean if self.n else math.nan,
+                    variance=self.variance, std=self.std, **dict(self.labels))
+
+    def __repr__(self):
+        return f'RunningStats(count={self.count}, mean={self.mean:.4f}, std={self.std:.4f})'
+
+
+def _epoch_seconds(timestamp):
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    if isinstance(timestamp, date):
+        return datetime(timestamp.year, timestamp.month, timestamp.day, tzinfo=timezone.utc).timestamp()
+    if isinstance(timestamp, str):
+        return _epoch_seconds(datetime.fromisoformat(timestamp))
+    return float(timestamp)
+
+
+class WindowedAggregates:
+    """Online RunningStats per (source, language, time bucket).
+
+    With `bucket_seconds` set, timestamps (datetime, date, ISO string or
+    epoch seconds; naive times are UTC) fall into tumbling buckets of that
+    width, numbered from the epoch. With `bucket_seconds=None` the timestamp
+    itself is the bucket key (e.g. '2024-05'), and buckets are ordered by
+    sorting their keys.
+
+    add() is O(1) per headline. Sliding windows are answered from the
+    bucket states, never from raw headlines, so only `max_buckets` buckets
+    per key are kept when it is set. States from other processes are
+    combined with merge().
+    """
+
+    def __init__(self, bucket_seconds=3600, max_buckets=None):
+        self.bucket_seconds = bucket_seconds
+        self.max_buckets = max_buckets
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(buckets) for buckets in self._states.values())
+
+    def bucket_of(self, timestamp):
+        if self.bucket_seconds is None:
+            return timestamp
+        return int(_epoch_seconds(timestamp) // self.bucket_seconds)
+
+    def bucket_start(self, bucket):
+        """Start of a numbered bucket as a UTC datetime (the key itself
+        when buckets are not time-based)."""
+        if self.bucket_seconds is None:
+            return bucket
+        return datetime.fromtimestamp(bucket * self.bucket_seconds, tz=timezone.utc)
+
+    def add(self, source, language, timestamp, value=None, label=None):
+        bucket = self.bucket_of(timestamp)
+        with self._lock:
+            buckets = self._states.setdefault((source, language), {})
+            stats = buckets.get(bucket)
+            if stats is None:
+                stats = buckets[bucket] = RunningStats()
+                if self.max_buckets and len(buckets) > self.max_buckets:
+                    self._evict(buckets)
+            stats.update(value, label)
+
+    def _evict(self, buckets):
+        for bucket in sorted(buckets)[:len(buckets) - self.max_buckets]:
+            del buckets[bucket]
+
+    def add_headlines(self, enriched, timestamp, value_key='sentiment_score', label_key='sentiment_label'):
+        """Feed main.py-style {source: [headline dicts]} scored at `timestamp`;
+        an item's own 'timestamp' wins when present."""
+        for source, items in enriched.items():
+            for item in items:
+                self.add(source, item.get('language', 'unknown'), item.get('timestamp', timestamp),
+                         item.get(value_key), item.get(label_key))
+
+    def merge(self, other):
+        """Fold another WindowedAggregates (same bucketing) into this one."""
+        if other.bucket_seconds != self.bucket_seconds:
+            raise ValueError('cannot merge aggregates with different bucket widths')
+        with self._lock:
+            for key, buckets in other._states.items():
+                mine = self._states.setdefault(key, {})
+                for bucket, stats in buckets.items():
+                    if bucket in mine:
+                        mine[bucket].merge(stats)
+                    else:
+                        mine[bucket] = stats.copy()
+                if self.max_buckets and len(mine) > self.max_buckets:
+                    self._evict(mine)
+        return self
+
+    def keys(self):
+        return list(self._states)
+
+    def _selected(self, source, language):
+        with self._lock:
+            return [{b: s.copy() for b, s in buckets.items()} for (src, lang), buckets in self._states.items()
+                    if (source is None or src == source) and (language is None or lang == language)]
+
+    def tumbling(self, source=None, language=None):
+        """{bucket: RunningStats} in bucket order, merged over the matching
+        sources/languages (None matches all)."""
+        merged = {}
+        for buckets in self._selected(source, language):
+            for bucket, stats in buckets.items():
+                if bucket in merged:
+                    merged[bucket].merge(stats)
+                else:
+                    merged[bucket] = stats
+        return {bucket: merged[bucket] for bucket in sorted(merged)}
+
+    def sliding(self, window, source=None, language=None):
+        """{bucket: RunningStats of the `window` buckets ending there}.
+
+        Numbered buckets cover the time range (bucket - window, bucket], so
+        empty buckets count towards the window; keyed buckets use the
+        `window` most recent keys present. O(buckets * window) merges of
+        fixed-size states.
+        """
+        buckets = self.tumbling(source, language)
+        order = list(buckets)
+        result = {}
+        for i, bucket in enumerate(order):
+            stats = RunningStats()
+            if self.bucket_seconds is None:
+                members = order[max(0, i - window + 1):i + 1]
+            else:
+                members = [b for b in order[max(0, i - window + 1):i + 1] if b > bucket - window]
+            for member in members:
+                stats.merge(buckets[member])
+            result[bucket] = stats
+        return result
+
+    def totals(self, by=('source', 'language')):
+        """Whole-history RunningStats per source, language or both."""
+        fields = ('source', 'language')
+        by = (by,) if isinstance(by, str) else tuple(by)
+        totals = {}
+        with self._lock:
+            for key, buckets in self._states.items():
+                group = tuple(key[fields.index(f)] for f in by)
+                group = group[0] if len(group) == 1 else group
+                stats = totals.setdefault(group, RunningStats())
+                for bucket_stats in buckets.values():
+                    stats.merge(bucket_stats)
+        return totals
+
+    def trend(self, source=None, language=None, window=1):
+        """Dashboard-ready rows, one per bucket: start, count, mean, std and
+        label counts, over tumbling (window=1) or sliding windows."""
+        import pandas as pd
+        series = self.tumbling(source, language) if window == 1 else self.sliding(window, source, language)
+        frame = pd.DataFrame([dict(bucket=self.bucket_start(b), **s.to_dict()) for b, s in series.items()])
+        return frame.set_index('bucket') if not frame.empty else frame
+
+
+# Example usage
+if __name__ == "__main__":
+    aggregates = WindowedAggregates(bucket_seconds=3600)
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc).timestamp()
+    rng = np.random.RandomState(0)
+    for i in range(2000):
+        source = ('times_of_india', 'vijaya_karnataka')[i % 2]
+        score = float(np.clip(rng.normal(-0.2 if i % 2 else 0.1, 0.4), -1, 1))
+        label = 'positive' if score > 0.1 else 'negative' if score < -0.1 else 'neutral'
+        aggregates.add(source, ('en', 'kn')[i % 2], start + i * 18, score, label)
+
+    print(aggregates.trend(source='vijaya_karnataka'))
+    print("\nThree-hour sliding window, all sources:")
+    print(aggregates.trend(window=3))
+    print("\nTotals per source:")
+    for source, stats in aggregates.totals('source').items():
+        print(source, stats)
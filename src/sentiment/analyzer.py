@@ -1,134 +1,412 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from sentiment.aggregates import LABELS, RunningStats, WindowedAggregates
+from sentiment.lexicon import NATIVE_LANGUAGES, get_lexicon, get_native_lexicon
+
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def _chunks(items, size):
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Model held by each process-pool worker, set once by _init_worker.
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _predict_chunk(chunk):
+    return list(_worker_model.predict(chunk))
+
+
 class SentimentAnalyzer:
-    def __init__(self, model):
+    def __init__(self, model, chunk_size=DEFAULT_CHUNK_SIZE, n_jobs=None):
         self.model = model
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+
+    def iter_sentiment(self, headlines, chunk_size=None, n_jobs=None):
+        """Yield one prediction per headline, in order.
 
-    def analyze_sentiment(self, headlines):
-        sentiments = []
-        for headline in headlines:
-            sentiment = self.model.predict(headline)
-            sentiments.append(sentiment)
-        return sentiments
+        `headlines` can be any iterable; it is consumed `chunk_size` at a
+        time and each chunk is one vectorized `model.predict` call. With
+        `n_jobs` > 1, chunks are predicted in a process pool (the model is
+        sent to each worker once), keeping at most 2 * n_jobs chunks in
+        flight.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        n_jobs = n_jobs or self.n_jobs
+        if not n_jobs or n_jobs <= 1:
+            for chunk in _chunks(headlines, chunk_size):
+                yield from self.model.predict(chunk)
+            return
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(self.model,)) as pool:
+            pending = deque()
+            for chunk in _chunks(headlines, chunk_size):
+                pending.append(pool.submit(_predict_chunk, chunk))
+                if len(pending) >= 2 * n_jobs:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def analyze_sentiment(self, headlines, chunk_size=None, n_jobs=None):
+        return list(self.iter_sentiment(headlines, chunk_size, n_jobs))
 
     def compare_sentiments(self, sentiments_a, sentiments_b):
-        comparison = {
-            'positive': sum(1 for s in sentiments_a if s == 'positive') - sum(1 for s in sentiments_b if s == 'positive'),
-            'negative': sum(1 for s in sentiments_a if s == 'negative') - sum(1 for s in sentiments_b if s == 'negative'),
-            'neutral': sum(1 for s in sentiments_a if s == 'neutral') - sum(1 for s in sentiments_b if s == 'neutral'),
-        }
-        return comparison
+        """Per-label count difference (a - b), one pass over each list."""
+        a = RunningStats.from_values(labels=sentiments_a).label_counts()
+        b = RunningStats.from_values(labels=sentiments_b).label_counts()
+        return {label: a[label] - b[label] for label in LABELS}
 
     def sentiment_shift(self, sentiments_over_time):
-        shift = {}
-        for time_period, sentiments in sentiments_over_time.items():
-            shift[time_period] = {
-                'positive': sum(1 for s in sentiments if s == 'positive'),
-                'negative': sum(1 for s in sentiments if s == 'negative'),
-                'neutral': sum(1 for s in sentiments if s == 'neutral'),
-            }
-        return shift
+        """Label counts per time period.
 
+        Takes {period: [labels]} or a WindowedAggregates fed as headlines
+        are scored; the latter answers from its running per-bucket state
+        (merged over sources and languages) without the label history.
+        """
+        if isinstance(sentiments_over_time, WindowedAggregates):
+            return {period: stats.label_counts()
+                    for period, stats in sentiments_over_time.tumbling().items()}
+        return {period: RunningStats.from_values(labels=sentiments).label_counts()
+                for period, sentiments in sentiments_over_time.items()}
 
-def analyze_headlines(headlines):
-    """Given a list of headline dicts with key 'headline', return list of dicts
-    with sentiment score and label (POSITIVE/NEGATIVE/NEUTRAL). Uses
-    transformers pipeline if available, else falls back to TextBlob polarity.
-    """
-    results = []
+
+# ---------------- RULE-BASED SCORER ----------------
+def rule_score(text):
+    """Weighted whole-word keyword matching, clamped to -1..1."""
+    return get_lexicon().score(text)
+
+
+def _label_polarity(pol):
+    if pol > 0.1:
+        return 'POSITIVE'
+    elif pol < -0.1:
+        return 'NEGATIVE'
+    return 'NEUTRAL'
+
+
+# ---------------- BACKEND REGISTRY ----------------
+# Probe order used when no backend is requested explicitly.
+BACKEND_ORDER = ('transformers', 'textblob', 'rules')
+DEFAULT_BATCH_SIZE = 32
+MAX_TOKENS = 512
+
+_backend_lock = threading.RLock()
+_backend_models = {}
+_backend_errors = {}
+_default_backend = None
+
+
+def _load_transformers():
+    from transformers import pipeline
+    return pipeline('sentiment-analysis')
+
+
+def _load_textblob():
+    from textblob import TextBlob
+    return TextBlob
+
+
+def _load_rules():
+    # Resolved per batch so set_lexicon() takes effect without a reload.
+    return get_lexicon
+
+
+def _map_pipeline_output(out):
+    label = out['label']
+    score = out.get('score', 0.0)
+    # normalize to -1..1
+    if label.upper().startswith('NEG'):
+        return (-score, 'NEGATIVE', score)
+    elif label.upper().startswith('POS'):
+        return (score, 'POSITIVE', score)
+    return (0.0, 'NEUTRAL', score)
+
+
+def _token_lengths(tokenizer, texts, max_length):
     try:
-        from transformers import pipeline
-        print('[*] Using transformers pipeline for sentiment')
-        nlp = pipeline('sentiment-analysis')
-        for h in headlines:
-            text = h.get('headline')
-            if not text:
-                r = dict(h)
-                r.update({'sentiment_score': 0.0, 'sentiment_label': 'NEUTRAL', 'confidence': 0.0})
-                results.append(r)
-                continue
-            out = nlp(text[:512])[0]
-            label = out['label']
-            score = out.get('score', 0.0)
-            # normalize to -1..1
-            if label.upper().startswith('NEG'):
-                norm = -score
-                mapped = 'NEGATIVE'
-            elif label.upper().startswith('POS'):
-                norm = score
-                mapped = 'POSITIVE'
-            else:
-                norm = 0.0
-                mapped = 'NEUTRAL'
-            r = dict(h)
-            r.update({'sentiment_score': norm, 'sentiment_label': mapped, 'confidence': score})
-            results.append(r)
+        encoded = tokenizer(texts, truncation=True, max_length=max_length)
+        return [len(ids) for ids in encoded['input_ids']]
+    except Exception:
+        # rough proxy if the tokenizer cannot be called directly
+        return [len(t.split()) for t in texts]
+
+
+def _score_transformers(nlp, texts, batch_size=DEFAULT_BATCH_SIZE, languages=None):
+    """Batched inference: headlines are sorted by token length so each batch
+    pads to a similar length, truncated on tokens, and returned in input order."""
+    results = [(0.0, 'NEUTRAL', 0.0)] * len(texts)
+    idx = [i for i, t in enumerate(texts) if t]
+    if not idx:
         return results
-    except Exception as e:
-        print(f"[!] transformers pipeline failed: {e}")
-        # fallback
+
+    tokenizer = getattr(nlp, 'tokenizer', None)
+    max_length = min(getattr(tokenizer, 'model_max_length', MAX_TOKENS) or MAX_TOKENS, MAX_TOKENS)
+    if tokenizer is not None:
+        lengths = _token_lengths(tokenizer, [texts[i] for i in idx], max_length)
+        idx = [i for _, i in sorted(zip(lengths, idx))]
+
+    for start in range(0, len(idx), batch_size):
+        bucket = idx[start:start + batch_size]
+        outs = nlp([texts[i] for i in bucket], batch_size=len(bucket),
+                   truncation=True, max_length=max_length)
+        for i, out in zip(bucket, outs):
+            results[i] = _map_pipeline_output(out)
+    return results
+
+
+def _score_textblob(TextBlob, texts, batch_size=DEFAULT_BATCH_SIZE, languages=None):
+    results = []
+    for text in texts:
+        if not text:
+            results.append((0.0, 'NEUTRAL', 0.0))
+            continue
+        pol = TextBlob(text).sentiment.polarity
+        results.append((pol, _label_polarity(pol), abs(pol)))
+    return results
+
+
+def _score_rules(lexicon, texts, batch_size=DEFAULT_BATCH_SIZE, languages=None):
+    return [(pol, _label_polarity(pol), abs(pol)) for pol in lexicon().score_many(texts)]
+
+
+def _load_compiled():
+    model_dir = os.environ.get('SENTIMENT_COMPILED_MODEL')
+    if not model_dir:
+        raise RuntimeError('SENTIMENT_COMPILED_MODEL is not set')
+    from sentiment.compiled import CompiledSentimentModel
+    return CompiledSentimentModel.load(model_dir)
+
+
+def _score_compiled(model, texts, batch_size=DEFAULT_BATCH_SIZE, languages=None):
+    """Score with a model exported by sentiment.compiled; its classes are
+    expected to be positive/negative/neutral labels."""
+    results = [(0.0, 'NEUTRAL', 0.0)] * len(texts)
+    idx = [i for i, t in enumerate(texts) if t and t.strip()]
+    if not idx:
+        return results
+    proba = model.predict_proba([texts[i] for i in idx])
+    best = proba.argmax(axis=1)
+    for i, k, p in zip(idx, best, proba[np.arange(len(idx)), best]):
+        label, p = str(model.classes_[k]).upper(), float(p)
+        if label.startswith('POS'):
+            results[i] = (p, 'POSITIVE', p)
+        elif label.startswith('NEG'):
+            results[i] = (-p, 'NEGATIVE', p)
+        else:
+            results[i] = (0.0, 'NEUTRAL', p)
+    return results
+
+
+def _load_native():
+    return get_native_lexicon
+
+
+def _score_native(lexicon_for, texts, batch_size=DEFAULT_BATCH_SIZE, languages=None):
+    """Score untranslated headlines with their language's native-script lexicon."""
+    results = []
+    for text, language in zip(texts, languages or [None] * len(texts)):
+        if language not in NATIVE_LANGUAGES:
+            raise ValueError(f"no native lexicon for language '{language}'")
+        pol = lexicon_for(language).score(text)
+        results.append((pol, _label_polarity(pol), abs(pol)))
+    return results
+
+
+_BACKENDS = {
+    'transformers': (_load_transformers, _score_transformers),
+    'textblob': (_load_textblob, _score_textblob),
+    'rules': (_load_rules, _score_rules),
+    # Not in BACKEND_ORDER: only used when asked for by name.
+    'compiled': (_load_compiled, _score_compiled),
+    # Not in BACKEND_ORDER: it only scores hi/bn/ta/kn, via language_backends.
+    'native': (_load_native, _score_native),
+}
+# language_backends that score native-script headlines without translation.
+NATIVE_LANGUAGE_BACKENDS = {language: 'native' for language in NATIVE_LANGUAGES}
+
+
+def load_backend(name):
+    """Load a sentiment backend by name, at most once per process.
+
+    The model object is cached, and so is a failed import, so an unavailable
+    backend is not re-probed on every batch. Raises RuntimeError if the
+    backend cannot be loaded.
+    """
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{name}' (expected one of {sorted(_BACKENDS)})")
+    with _backend_lock:
+        if name in _backend_models:
+            return _backend_models[name]
+        if name in _backend_errors:
+            raise RuntimeError(f"{name} backend unavailable: {_backend_errors[name]}")
         try:
-            from textblob import TextBlob
-            print('[*] Using TextBlob fallback for sentiment')
-            for h in headlines:
-                text = h.get('headline') or ''
-                if not text:
-                    r = dict(h)
-                    r.update({'sentiment_score': 0.0, 'sentiment_label': 'NEUTRAL', 'confidence': 0.0})
-                    results.append(r)
+            model = _BACKENDS[name][0]()
+        except Exception as e:
+            _backend_errors[name] = e
+            print(f"[!] {name} backend unavailable: {e}")
+            raise RuntimeError(f"{name} backend unavailable: {e}") from e
+        _backend_models[name] = model
+        return model
+
+
+def get_backend(name=None):
+    """Return (backend_name, model).
+
+    With no name, the first backend in BACKEND_ORDER that loads becomes the
+    process-wide default and is reused by every later call.
+    """
+    global _default_backend
+    if name:
+        return name, load_backend(name)
+    with _backend_lock:
+        if _default_backend is None:
+            for candidate in BACKEND_ORDER:
+                try:
+                    load_backend(candidate)
+                except RuntimeError:
                     continue
-                tb = TextBlob(text)
-                pol = tb.sentiment.polarity
-                if pol > 0.1:
-                    mapped = 'POSITIVE'
-                elif pol < -0.1:
-                    mapped = 'NEGATIVE'
-                else:
-                    mapped = 'NEUTRAL'
-                r = dict(h)
-                r.update({'sentiment_score': pol, 'sentiment_label': mapped, 'confidence': abs(pol)})
-                results.append(r)
-            return results
-        except Exception as e2:
-            print(f"[!] TextBlob fallback failed: {e2}")
-            print('[*] Using rule-based fallback for sentiment')
-            # Rule-based fallback: simple keyword matching with weights
-            negative_keywords = {
-                'bomb': 1.0, 'blast': 1.0, 'attack': 1.0, 'killed': 0.9, 'dies': 0.9,
-                'death': 1.0, 'murder': 1.0, 'fire': 0.8, 'crash': 0.8, 'accident': 0.7,
-                'violence': 0.9, 'clash': 0.7, 'protest': 0.4, 'injured': 0.8, 'shooting': 1.0,
-                'suffocating': 0.6, 'attack':1.0, 'terror':1.0
-            }
-            positive_keywords = {
-                'win': 0.8, 'victory': 0.9, 'celebrated': 0.6, 'honours': 0.5, 'launch': 0.3,
-                'introduced': 0.2, 'new': 0.1
-            }
-            def rule_score(text):
-                if not text:
-                    return 0.0
-                low = text.lower()
-                score = 0.0
-                for kw, w in negative_keywords.items():
-                    if kw in low:
-                        score -= w
-                for kw, w in positive_keywords.items():
-                    if kw in low:
-                        score += w
-                # clamp
-                if score > 1.0:
-                    score = 1.0
-                if score < -1.0:
-                    score = -1.0
-                return score
-
-            for h in headlines:
-                text = h.get('headline') or ''
-                pol = rule_score(text)
-                if pol > 0.1:
-                    mapped = 'POSITIVE'
-                elif pol < -0.1:
-                    mapped = 'NEGATIVE'
-                else:
-                    mapped = 'NEUTRAL'
-                r = dict(h)
-                r.update({'sentiment_score': pol, 'sentiment_label': mapped, 'confidence': abs(pol)})
-                results.append(r)
-            return results
\ No newline at end of file
+                _default_backend = candidate
+                print(f'[*] Using {candidate} backend for sentiment')
+                break
+        return _default_backend, _backend_models[_default_backend]
+
+
+def set_default_backend(name):
+    """Pin the backend used when analyze_headlines is called without one."""
+    global _default_backend
+    load_backend(name)
+    with _backend_lock:
+        _default_backend = name
+
+
+def warm_up(backend=None):
+    """Load the backend and run one dummy inference so the first real batch
+    does not pay for model construction. Returns the backend name."""
+    name, model = get_backend(backend)
+    # the native backend needs a language per text; warm every lexicon
+    languages = sorted(NATIVE_LANGUAGES) if name == 'native' else [None]
+    _BACKENDS[name][1](model, ['warm up'] * len(languages), languages=languages)
+    return name
+
+
+def reset_backends():
+    """Drop every cached model and probe result."""
+    global _default_backend
+    with _backend_lock:
+        _backend_models.clear()
+        _backend_errors.clear()
+        _default_backend = None
+
+
+# Throughput of the most recent analyze_headlines call.
+last_run_stats = {}
+
+
+def _score_with(backend, texts, languages, batch_size):
+    """Score with `backend`, or with the default, falling through
+    BACKEND_ORDER when the default fails on this batch. Returns
+    (backend_name, results).
+
+    Only load failures are cached: an inference error moves this batch to
+    the next backend and the default is tried again on the next call.
+    """
+    name, model = get_backend(backend)
+    try:
+        return name, _BACKENDS[name][1](model, texts, batch_size, languages=languages)
+    except Exception as e:
+        # a default pinned outside BACKEND_ORDER (native, compiled) has no fallbacks
+        if backend or name not in BACKEND_ORDER or name == BACKEND_ORDER[-1]:
+            raise
+        print(f"[!] {name} backend failed: {e}")
+        error = e
+    for fallback in BACKEND_ORDER[BACKEND_ORDER.index(name) + 1:]:
+        try:
+            model = load_backend(fallback)
+        except RuntimeError:
+            continue
+        try:
+            return fallback, _BACKENDS[fallback][1](model, texts, batch_size, languages=languages)
+        except Exception as e:
+            print(f"[!] {fallback} backend failed: {e}")
+            error = e
+    raise error
+
+
+def analyze_headlines(headlines, backend=None, batch_size=DEFAULT_BATCH_SIZE, verbose=True,
+                      language_backends=None):
+    """Given a list of headline dicts with key 'headline', return list of dicts
+    with sentiment score and label (POSITIVE/NEGATIVE/NEUTRAL).
+
+    The backend is resolved through the process-wide registry: transformers
+    pipeline if available, else TextBlob polarity, else the rule-based
+    keyword scorer. Pass `backend` to pick one explicitly. Transformer
+    inference runs in length-bucketed batches of `batch_size` headlines.
+
+    `language_backends` maps a headline's 'language' to the backend for it,
+    e.g. NATIVE_LANGUAGE_BACKENDS scores hi/bn/ta/kn headlines in their own
+    script; if that backend fails, those headlines fall back to `backend`.
+    Each result records the backend that scored it.
+    """
+    texts = [h.get('headline') or '' for h in headlines]
+    languages = [h.get('language') for h in headlines]
+    groups = {}
+    for i, language in enumerate(languages):
+        groups.setdefault((language_backends or {}).get(language, backend), []).append(i)
+
+    started = time.perf_counter()
+    scored = [None] * len(texts)
+    names = [None] * len(texts)
+    used = {}
+    for choice, positions in groups.items():
+        group_texts = [texts[i] for i in positions]
+        group_languages = [languages[i] for i in positions]
+        try:
+            name, part = _score_with(choice, group_texts, group_languages, batch_size)
+        except Exception as e:
+            if choice == backend:
+                raise
+            print(f"[!] {choice} backend failed: {e}")
+            name, part = _score_with(backend, group_texts, group_languages, batch_size)
+        for i, result in zip(positions, part):
+            scored[i] = result
+            names[i] = name
+        used[name] = used.get(name, 0) + len(positions)
+
+    elapsed = time.perf_counter() - started
+    rate = len(texts) / elapsed if elapsed > 0 else float('inf')
+    last_run_stats.clear()
+    last_run_stats.update({'backend': max(used, key=used.get) if used else None, 'backends': used,
+                           'headlines': len(texts), 'seconds': elapsed,
+                           'headlines_per_sec': rate, 'batch_size': batch_size})
+    if texts and verbose:
+        print(f"[*] Scored {len(texts)} headlines with {', '.join(used)} in {elapsed:.2f}s "
+              f"({rate:.1f} headlines/sec)")
+
+    results = []
+    for h, (score, label, confidence), name in zip(headlines, scored, names):
+        r = dict(h)
+        r.update({'sentiment_score': score, 'sentiment_label': label, 'confidence': confidence,
+                  'backend': name})
+        results.append(r)
+    return results
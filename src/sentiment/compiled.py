@@ -0,0 +1,182 @@
+"""Compile a fitted SentimentModel into plain NumPy arrays.
+
+    python -m sentiment.compiled model.joblib models/compiled
+
+writes `meta.json` plus `hashes.npy`, `idf.npy`, `coef.npy` and
+`intercept.npy`. CompiledSentimentModel.load memory-maps them, so scoring
+needs only NumPy, starts in milliseconds and worker processes share the
+pages. Predictions match the sklearn model.
+"""
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+FORMAT_VERSION = 1
+ARRAYS = ('hashes', 'idf', 'coef', 'intercept')
+
+
+def term_hash(term):
+    """Stable 64-bit hash of a vocabulary term (unlike hash(), the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def export_model(model, out_dir):
+    """Write the compiled form of a fitted SentimentModel to `out_dir`.
+
+    Only the TfidfVectorizer options this module reimplements are
+    accepted (word analyzer, token_pattern, lowercase, ngram_range, norm,
+    sublinear_tf, binary); anything else raises ValueError.
+    """
+    vectorizer, classifier = getattr(model, 'vectorizer', None), getattr(model, 'classifier', None)
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    if not isinstance(vectorizer, TfidfVectorizer) or not hasattr(vectorizer, 'vocabulary_') \
+            or not hasattr(classifier, 'coef_'):
+        raise ValueError('only a fitted TfidfVectorizer-based SentimentModel can be compiled')
+    if vectorizer.analyzer != 'word' or vectorizer.tokenizer or vectorizer.preprocessor \
+            or vectorizer.stop_words or vectorizer.strip_accents:
+        raise ValueError('only the default word analyzer without stop words or custom '
+                         'tokenizer/preprocessor/strip_accents can be compiled')
+    if vectorizer.norm not in ('l2', 'l1', None):
+        raise ValueError(f'unsupported norm {vectorizer.norm!r}')
+
+    terms = vectorizer.get_feature_names_out()
+    hashes = np.fromiter((term_hash(t) for t in terms), dtype=np.uint64, count=len(terms))
+    order = np.argsort(hashes, kind='stable')
+    hashes = hashes[order]
+    if len(hashes) > 1 and (np.diff(hashes) == 0).any():
+        raise ValueError('vocabulary hash collision; cannot compile this model')
+
+    idf = vectorizer.idf_[order] if vectorizer.use_idf else np.ones(len(terms))
+    arrays = {
+        'hashes': hashes,
+        'idf': np.ascontiguousarray(idf, dtype=np.float64),
+        'coef': np.ascontiguousarray(classifier.coef_[:, order], dtype=np.float64),
+        'intercept': np.asarray(classifier.intercept_, dtype=np.float64),
+    }
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'classes': [c.item() if hasattr(c, 'item') else c for c in classifier.classes_],
+        'token_pattern': vectorizer.token_pattern,
+        'lowercase': vectorizer.lowercase,
+        'ngram_range': list(vectorizer.ngram_range),
+        'norm': vectorizer.norm,
+        'sublinear_tf': vectorizer.sublinear_tf,
+        'binary': vectorizer.binary,
+        'n_features': len(terms),
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, f'{name}.npy'), array)
+    with open(os.path.join(out_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    return out_dir
+
+
+class CompiledSentimentModel:
+    """NumPy-only scorer for a model written by export_model."""
+
+    def __init__(self, meta, hashes, idf, coef, intercept):
+        self.meta = meta
+        self.classes_ = np.asarray(meta['classes'])
+        self.hashes = hashes
+        self.idf = idf
+        self.coef = coef
+        self.intercept = intercept
+        self._token_re = re.compile(meta['token_pattern'])
+        self._ngram_range = tuple(meta['ngram_range'])
+
+    @classmethod
+    def load(cls, model_dir, mmap_mode='r'):
+        with open(os.path.join(model_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"unsupported compiled model format {meta.get('format_version')}")
+        arrays = {name: np.load(os.path.join(model_dir, f'{name}.npy'), mmap_mode=mmap_mode)
+                  for name in ARRAYS}
+        return cls(meta, **arrays)
+
+    def _terms(self, text):
+        if self.meta['lowercase']:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        low, high = self._ngram_range
+        if high == 1:
+            return tokens
+        terms = list(tokens) if low == 1 else []
+        for n in range(max(2, low), high + 1):
+            terms.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def transform(self, texts):
+        """(rows, columns, values) of the TF-IDF matrix in coordinate form."""
+        rows, hashes = [], []
+        for row, text in enumerate(texts):
+            terms = self._terms(text or '')
+            rows.extend([row] * len(terms))
+            hashes.extend(term_hash(t) for t in terms)
+        rows = np.asarray(rows, dtype=np.int64)
+        hashes = np.asarray(hashes, dtype=np.uint64)
+
+        cols = np.searchsorted(self.hashes, hashes)
+        cols[cols == len(self.hashes)] = 0
+        known = self.hashes[cols] == hashes if len(self.hashes) else np.zeros(len(hashes), bool)
+        rows, cols = rows[known], cols[known]
+
+        # Count repeated (row, column) pairs, as CountVectorizer does.
+        keys, counts = np.unique(rows * len(self.hashes) + cols, return_counts=True)
+        rows, cols = keys // len(self.hashes), keys % len(self.hashes)
+        tf = np.ones(len(counts)) if self.meta['binary'] else counts.astype(np.float64)
+        if self.meta['sublinear_tf']:
+            tf = np.log(tf) + 1
+        values = tf * self.idf[cols]
+
+        norm = self.meta['norm']
+        if norm:
+            weights = values ** 2 if norm == 'l2' else np.abs(values)
+            norms = np.bincount(rows, weights=weights, minlength=len(texts))
+            if norm == 'l2':
+                norms = np.sqrt(norms)
+            norms[norms == 0] = 1.0
+            values = values / norms[rows]
+        return rows, cols, values
+
+    def decision_function(self, texts):
+        texts = list(texts)
+        rows, cols, values = self.transform(texts)
+        scores = np.empty((len(texts), len(self.coef)))
+        for k in range(len(self.coef)):
+            scores[:, k] = np.bincount(rows, weights=values * self.coef[k, cols], minlength=len(texts))
+        scores += self.intercept
+        return scores[:, 0] if len(self.coef) == 1 else scores
+
+    def predict(self, texts):
+        scores = self.decision_function(texts)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+    def predict_proba(self, texts):
+        """Class probabilities of a (multinomial) LogisticRegression."""
+        scores = self.decision_function(texts)
+        if scores.ndim == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores))
+            return np.column_stack([1 - positive, positive])
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile a joblib-saved SentimentModel to NumPy arrays.')
+    parser.add_argument('model', help='Path written by evaluate.py --model-out')
+    parser.add_argument('out_dir')
+    args = parser.parse_args()
+
+    from joblib import load
+    export_model(load(args.model), args.out_dir)
+    print(f"[*] Compiled {args.model} to {args.out_dir}")
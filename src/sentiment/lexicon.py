@@ -0,0 +1,253 @@
+import json
+import os
+import re
+import threading
+import unicodedata
+
+# Built-in weights for the rule-based fallback. A trailing '*' marks a stem
+# that matches any word starting with it ('attack*' -> attacks, attacked);
+# everything else only matches whole words.
+NEGATIVE_KEYWORDS = {
+    'bomb*': 1.0, 'blast*': 1.0, 'attack*': 1.0, 'killed': 0.9, 'dies': 0.9,
+    'death': 1.0, 'deaths': 1.0, 'murder*': 1.0, 'fire': 0.8, 'fires': 0.8, 'crash*': 0.8,
+    'accident*': 0.7, 'violence': 0.9, 'clash*': 0.7, 'protest*': 0.4, 'injured': 0.8,
+    'shooting': 1.0, 'suffocating': 0.6, 'terror*': 1.0
+}
+POSITIVE_KEYWORDS = {
+    'win': 0.8, 'wins': 0.8, 'winning': 0.8, 'victory': 0.9, 'celebrated': 0.6, 'honours': 0.5,
+    'launch*': 0.3, 'introduced': 0.2, 'new': 0.1
+}
+
+# Words, keeping internal apostrophes ("don't", "India's").
+TOKEN_PATTERN = r"\w+(?:['’]\w+)*"
+# \w alone splits Indic words at vowel signs and viramas (combining marks),
+# so take the whole Devanagari..Kannada block range plus ZWJ/ZWNJ, minus the
+# danda punctuation.
+INDIC_TOKEN_PATTERN = r"[\w\u0900-\u0963\u0966-\u0CFF\u200c\u200d]+"
+
+DEFAULT_LEXICON_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'lexicons'))
+
+# Native-script negation. `direction` says where the negated word sits
+# relative to the negator: Hindi nahin comes before the verb but after a
+# predicate adjective ('ghayal nahin'), while Bengali, Tamil and Kannada
+# negate after the word or with a verb suffix.
+NEGATION_RULES = {
+    'hi': {'negators': ('नहीं', 'न', 'ना', 'मत', 'बिना'), 'direction': 'both'},
+    'bn': {'negators': ('না', 'নি', 'নয়', 'নেই'), 'suffixes': ('েনি',), 'direction': 'after'},
+    'ta': {'negators': ('இல்லை', 'அல்ல', 'இல்லாமல்', 'இன்றி'), 'suffixes': ('வில்லை', 'ாமல்'),
+           'direction': 'after'},
+    'kn': {'negators': ('ಇಲ್ಲ', 'ಅಲ್ಲ', 'ಬೇಡ'), 'suffixes': ('ಿಲ್ಲ', 'ಲ್ಲದೆ'), 'direction': 'after'},
+}
+NATIVE_LANGUAGES = tuple(NEGATION_RULES)
+
+
+class KeywordLexicon:
+    """Weighted keyword/phrase matcher.
+
+    Entries are compiled into hash tables keyed by whole tokens, token
+    n-grams (multi-word phrases) and stem prefixes, so scoring a headline
+    costs one tokenization plus a few dict lookups per token no matter how
+    many entries the lexicon holds. Each entry counts at most once per text;
+    weights are signed (negative sentiment < 0) and the sum is clamped to
+    -1..1.
+
+    An entry within `negation_scope` tokens of a negator (on the side given
+    by `negation_direction`: 'before', 'after' or 'both'), or in a token ending with
+    one of `negation_suffixes`, is counted with its weight multiplied by
+    `negation_weight`.
+    """
+
+    def __init__(self, weights=None, token_pattern=TOKEN_PATTERN, negators=(), negation_suffixes=(),
+                 negation_direction='before', negation_scope=3, negation_weight=-0.75):
+        self._token_re = re.compile(token_pattern)
+        self.terms = {}
+        self.prefixes = {}
+        self.max_ngram = 1
+        self._prefix_lengths = ()
+        self.negators = {self._normalize(n) for n in negators}
+        self.negation_suffixes = tuple(self._normalize(n) for n in negation_suffixes)
+        self.negation_direction = negation_direction
+        self.negation_scope = negation_scope
+        self.negation_weight = negation_weight
+        if weights:
+            self.update(weights)
+
+    @classmethod
+    def from_polarity(cls, positive=None, negative=None, **kwargs):
+        """Build from separate {term: strength} dicts, as in the built-ins."""
+        lexicon = cls(**kwargs)
+        lexicon.update({term: -abs(w) for term, w in (negative or {}).items()})
+        lexicon.update(positive or {})
+        return lexicon
+
+    def __len__(self):
+        return len(self.terms) + len(self.prefixes)
+
+    @staticmethod
+    def _normalize(text):
+        return unicodedata.normalize('NFC', text).casefold()
+
+    def tokenize(self, text):
+        return self._token_re.findall(self._normalize(text)) if text else []
+
+    def add(self, term, weight):
+        term = self._normalize(term.strip())
+        if term.endswith('*'):
+            stem = term[:-1]
+            if stem:
+                self.prefixes[stem] = float(weight)
+                self._prefix_lengths = tuple(sorted({len(p) for p in self.prefixes}, reverse=True))
+            return
+        tokens = self.tokenize(term)
+        if tokens:
+            self.terms[' '.join(tokens)] = float(weight)
+            self.max_ngram = max(self.max_ngram, len(tokens))
+
+    def update(self, weights):
+        for term, weight in weights.items():
+            self.add(term, weight)
+        return self
+
+    def load(self, path):
+        """Merge entries from a lexicon file.
+
+        `.json` files hold a {term: weight} object. Anything else is read as
+        text with one `term<TAB or comma>weight` entry per line; blank lines
+        and lines starting with '#' are skipped. Returns the number of
+        entries read.
+        """
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                weights = json.load(f)
+            self.update(weights)
+            return len(weights)
+        count = 0
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                term, _, weight = line.rpartition('\t') if '\t' in line else line.rpartition(',')
+                try:
+                    self.add(term, float(weight))
+                except ValueError:
+                    continue
+                count += 1
+        return count
+
+    def _hits(self, tokens):
+        """(entry, token position) for every lexicon match in `tokens`."""
+        terms = self.terms
+        for i, token in enumerate(tokens):
+            if token in terms:
+                yield token, i
+            elif self._prefix_lengths:
+                for n in self._prefix_lengths:
+                    if len(token) >= n and token[:n] in self.prefixes:
+                        yield token[:n] + '*', i
+                        break
+            for n in range(2, min(self.max_ngram, len(tokens) - i) + 1):
+                phrase = ' '.join(tokens[i:i + n])
+                if phrase in terms:
+                    yield phrase, i
+
+    def _negated(self, tokens):
+        """Token positions that fall in the scope of a negation."""
+        if not (self.negators or self.negation_suffixes):
+            return set()
+        negated = set()
+        for i, token in enumerate(tokens):
+            if token in self.negators:
+                pass
+            elif self.negation_suffixes and token.endswith(self.negation_suffixes):
+                negated.add(i)
+            else:
+                continue
+            if self.negation_direction in ('before', 'both'):
+                negated.update(range(i + 1, min(len(tokens), i + 1 + self.negation_scope)))
+            if self.negation_direction in ('after', 'both'):
+                negated.update(range(max(0, i - self.negation_scope), i))
+        return negated
+
+    def matches(self, text):
+        """Lexicon entries found in `text` (each at most once)."""
+        return {entry for entry, _ in self._hits(self.tokenize(text))}
+
+    def weight(self, entry):
+        if entry.endswith('*'):
+            return self.prefixes[entry[:-1]]
+        return self.terms[entry]
+
+    def score(self, text):
+        tokens = self.tokenize(text)
+        negated = self._negated(tokens)
+        counted = set()
+        total = 0.0
+        for entry, i in self._hits(tokens):
+            key = (entry, i in negated)
+            if key in counted:
+                continue
+            counted.add(key)
+            total += self.weight(entry) * (self.negation_weight if key[1] else 1.0)
+        return max(-1.0, min(1.0, total))
+
+    def score_many(self, texts):
+        return [self.score(t) for t in texts]
+
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon():
+    """Process-wide lexicon for the rule backend: the built-in keywords plus
+    the file named by SENTIMENT_LEXICON_PATH, if set."""
+    global _lexicon
+    with _lexicon_lock:
+        if _lexicon is None:
+            lexicon = KeywordLexicon.from_polarity(POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS)
+            path = os.environ.get('SENTIMENT_LEXICON_PATH')
+            if path:
+                try:
+                    print(f"[*] Loaded {lexicon.load(path)} lexicon entries from {path}")
+                except OSError as e:
+                    print(f"[!] Could not load lexicon {path}: {e}")
+            _lexicon = lexicon
+        return _lexicon
+
+
+def set_lexicon(lexicon):
+    """Replace the process-wide lexicon (None rebuilds it on next use)."""
+    global _lexicon
+    with _lexicon_lock:
+        _lexicon = lexicon
+
+
+def native_lexicon(language, lexicon_dir=None):
+    """Build the native-script lexicon for `language` from
+    `<lexicon_dir>/<language>.tsv` with that language's negation rules.
+    `lexicon_dir` defaults to SENTIMENT_LEXICON_DIR or data/lexicons."""
+    lexicon_dir = lexicon_dir or os.environ.get('SENTIMENT_LEXICON_DIR') or DEFAULT_LEXICON_DIR
+    rules = NEGATION_RULES.get(language, {})
+    lexicon = KeywordLexicon(token_pattern=INDIC_TOKEN_PATTERN, negators=rules.get('negators', ()),
+                             negation_suffixes=rules.get('suffixes', ()),
+                             negation_direction=rules.get('direction', 'before'))
+    lexicon.load(os.path.join(lexicon_dir, f'{language}.tsv'))
+    return lexicon
+
+
+_native_lexicons = {}
+
+
+def get_native_lexicon(language):
+    """Cached native_lexicon(language); raises OSError if it has no lexicon file."""
+    with _lexicon_lock:
+        if language not in _native_lexicons:
+            _native_lexicons[language] = native_lexicon(language)
+        return _native_lexicons[language]
+
+
+def reset_native_lexicons():
+    with _lexicon_lock:
+        _native_lexicons.clear()
@@ -1,11 +1,14 @@
 from sklearn.base import BaseEstimator, ClassifierMixin
-from sklearn.linear_model import LogisticRegression
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.pipeline import Pipeline
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.pipeline import FeatureUnion
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
+import numpy as np
 import pandas as pd
 
+from sentiment.lexicon import INDIC_TOKEN_PATTERN
+
 class SentimentModel(BaseEstimator, ClassifierMixin):
     def __init__(self):
         self.vectorizer = TfidfVectorizer()
@@ -25,6 +28,102 @@ class SentimentModel(BaseEstimator, ClassifierMixin):
         predictions = self.classifier.predict(X_vectorized)
         return classification_report(y, predictions)
 
+class IncrementalSentimentModel(BaseEstimator, ClassifierMixin):
+    """Out-of-core variant of SentimentModel.
+
+    Features come from stateless HashingVectorizers (word n-grams with an
+    Indic-aware token pattern, plus character n-grams within word
+    boundaries), so there is no vocabulary to fit or hold in memory. The
+    linear SGD classifier is trained with partial_fit, which lets a model
+    be built from CSV chunks and updated later as new labeled headlines
+    arrive. Memory is bounded by n_features and the chunk size.
+    """
+
+    def __init__(self, n_features=2 ** 20, word_ngram_range=(1, 2), char_ngram_range=(2, 4),
+                 alpha=1e-5, classes=None, random_state=42):
+        self.n_features = n_features
+        self.word_ngram_range = word_ngram_range
+        self.char_ngram_range = char_ngram_range
+        self.alpha = alpha
+        self.classes = classes
+        self.random_state = random_state
+        # Built from the params at the first fit, so set_params() applies.
+        self.vectorizer = None
+        self.classifier = None
+        self.samples_seen = 0
+
+    def _build(self):
+        self.vectorizer = FeatureUnion([
+            ('word', HashingVectorizer(n_features=self.n_features, ngram_range=self.word_ngram_range,
+                                       token_pattern=INDIC_TOKEN_PATTERN, alternate_sign=False)),
+            ('char', HashingVectorizer(n_features=self.n_features, analyzer='char_wb',
+                                       ngram_range=self.char_ngram_range, alternate_sign=False)),
+        ])
+        self.classifier = SGDClassifier(loss='log_loss', alpha=self.alpha, random_state=self.random_state)
+        self.samples_seen = 0
+
+    def _is_fitted(self):
+        return hasattr(self.classifier, 'classes_')
+
+    def _transform(self, X):
+        if self.vectorizer is None:
+            self._build()
+        return self.vectorizer.transform(pd.Series(X).fillna('').astype(str))
+
+    def partial_fit(self, X, y, classes=None):
+        """Update the model with one batch; the full label set must be known
+        on the first call (from `classes` here or in the constructor)."""
+        if self.classifier is None:
+            self._build()
+        if not self._is_fitted():
+            classes = classes if classes is not None else self.classes
+            if classes is None:
+                raise ValueError('classes must be given on the first partial_fit call')
+            self.classifier.partial_fit(self._transform(X), y, classes=np.asarray(sorted(classes)))
+        else:
+            self.classifier.partial_fit(self._transform(X), y)
+        self.samples_seen += len(y)
+        return self
+
+    def fit(self, X, y):
+        """Train from scratch on in-memory data (one partial_fit pass)."""
+        self._build()
+        return self.partial_fit(X, y, classes=self.classes if self.classes is not None else np.unique(y))
+
+    def fit_csv(self, file_path, chunksize=100000, epochs=1, text_column='headline', label_column='sentiment',
+                holdout_fraction=0.0):
+        """Train (or keep training) from a labeled CSV read `chunksize` rows
+        at a time. With `holdout_fraction`, that share of each chunk is held
+        back and a classification report on it is returned after the last
+        epoch. Unknown classes are found with a label-only pass first."""
+        if not self._is_fitted() and self.classes is None:
+            self.classes = sorted(label_classes(file_path, label_column, chunksize))
+        y_true, y_pred = [], []
+        for epoch in range(epochs):
+            # Same seed every epoch, so the held-out rows stay held out.
+            rng = np.random.RandomState(self.random_state)
+            for X, y in load_data_chunks(file_path, chunksize, text_column, label_column):
+                held = rng.random_sample(len(y)) < holdout_fraction if holdout_fraction else np.zeros(len(y), bool)
+                if (~held).any():
+                    self.partial_fit(X[~held], y[~held])
+                if epoch == epochs - 1 and held.any():
+                    y_true.extend(y[held])
+                    y_pred.extend(self.predict(X[held]))
+            print(f'[*] Epoch {epoch + 1}/{epochs}: {self.samples_seen} samples seen')
+        if y_true:
+            return classification_report(y_true, y_pred, zero_division=0)
+        return None
+
+    def predict(self, X):
+        return self.classifier.predict(self._transform(X))
+
+    def predict_proba(self, X):
+        return self.classifier.predict_proba(self._transform(X))
+
+    def evaluate(self, X, y):
+        return classification_report(y, self.predict(X), zero_division=0)
+
+
 def load_data(file_path):
     data = pd.read_csv(file_path)
     return data['headline'], data['sentiment']
@@ -39,4 +138,30 @@ def train_model(data_file):
     report = model.evaluate(X_test, y_test)
     print(report)
     
-    return model
\ No newline at end of file
+    return model
+
+
+def load_data_chunks(file_path, chunksize=100000, text_column='headline', label_column='sentiment'):
+    """Yield (headlines, labels) NumPy arrays for each `chunksize` rows of a
+    labeled CSV; rows without a label are dropped."""
+    for chunk in pd.read_csv(file_path, usecols=[text_column, label_column], chunksize=chunksize):
+        chunk = chunk.dropna(subset=[label_column])
+        yield chunk[text_column].fillna('').astype(str).to_numpy(), chunk[label_column].to_numpy()
+
+
+def label_classes(file_path, label_column='sentiment', chunksize=100000):
+    """Distinct labels in a CSV, reading only the label column."""
+    classes = set()
+    for chunk in pd.read_csv(file_path, usecols=[label_column], chunksize=chunksize):
+        classes.update(chunk[label_column].dropna().unique())
+    return classes
+
+
+def train_incremental_model(data_file, chunksize=100000, epochs=1, model=None):
+    """Like train_model, but streams the CSV through an
+    IncrementalSentimentModel; pass `model` to warm-start from it."""
+    model = model or IncrementalSentimentModel()
+    report = model.fit_csv(data_file, chunksize=chunksize, epochs=epochs, holdout_fraction=0.2)
+    if report:
+        print(report)
+    return model
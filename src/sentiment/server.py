@@ -0,0 +1,255 @@
+"""Local HTTP scoring service on top of analyze_headlines.
+
+Usage (from src/):
+    python -m sentiment.server [--port 8808] [--backend rules] [--max-batch-size 32] [--max-wait-ms 10]
+
+    POST /score  {"headline": "..."}       -> {"sentiment_score", "sentiment_label", "confidence"}
+    POST /score  {"headlines": ["...", ...]} -> {"results": [...]}
+    GET  /stats                            -> queue depth, batch sizes, latency percentiles
+    GET  /health
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sentiment.analyzer import analyze_headlines, warm_up
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 10
+DEFAULT_MAX_QUEUE = 1024
+
+
+class QueueFull(Exception):
+    pass
+
+
+class MicroBatcher:
+    """Collects concurrent single-headline requests into batches.
+
+    A worker thread takes the first waiting request, then keeps collecting
+    until it has `max_batch_size` headlines or `max_wait_ms` has passed, and
+    scores the whole batch with one `score_fn(texts)` call. At most
+    `max_queue` headlines may wait; submit raises QueueFull beyond that.
+    """
+
+    def __init__(self, score_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 max_queue=DEFAULT_MAX_QUEUE, latency_window=10000):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.counters = {'requests': 0, 'rejected': 0, 'batches': 0, 'batched_items': 0, 'errors': 0}
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def _enqueue(self, text):
+        future = Future()
+        self._queue.put_nowait((text, future, time.perf_counter()))
+        return future
+
+    def _reject(self):
+        with self._lock:
+            self.counters['rejected'] += 1
+        raise QueueFull()
+
+    def submit(self, text):
+        """Queue one headline; returns a Future for its score dict."""
+        try:
+            future = self._enqueue(text)
+        except queue.Full:
+            self._reject()
+        with self._lock:
+            self.counters['requests'] += 1
+        return future
+
+    def submit_many(self, texts):
+        """Queue every headline or none: on QueueFull the ones already
+        queued are cancelled, so the worker skips them. Requests larger
+        than `max_queue` can never fit; callers should reject them first."""
+        futures = []
+        try:
+            for text in texts:
+                futures.append(self._enqueue(text))
+        except queue.Full:
+            for future in futures:
+                future.cancel()
+            self._reject()
+        with self._lock:
+            self.counters['requests'] += len(futures)
+        return futures
+
+    def _collect(self):
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = [item for item in self._collect() if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self.score_fn([text for text, _, _ in batch])
+            except Exception as e:
+                with self._lock:
+                    self.counters['errors'] += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            now = time.perf_counter()
+            with self._lock:
+                self.counters['batches'] += 1
+                self.counters['batched_items'] += len(batch)
+                for _, _, enqueued in batch:
+                    self._latencies.append(now - enqueued)
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            out = dict(self.counters)
+            latencies = sorted(self._latencies)
+        out['queue_depth'] = self._queue.qsize()
+        out['mean_batch_size'] = out['batched_items'] / out['batches'] if out['batches'] else 0.0
+        for p in (50, 90, 99):
+            out[f'p{p}_ms'] = _percentile(latencies, p) * 1000 if latencies else None
+        return out
+
+    def close(self):
+        self._stop.set()
+        self._worker.join(timeout=1.0)
+
+
+def _percentile(sorted_values, p):
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def make_score_fn(backend=None, batch_size=DEFAULT_MAX_BATCH_SIZE):
+    def score(texts):
+        analyzed = analyze_headlines([{'headline': t} for t in texts], backend=backend,
+                                     batch_size=batch_size, verbose=False)
+        return [{'sentiment_score': a['sentiment_score'], 'sentiment_label': a['sentiment_label'],
+                 'confidence': a['confidence']} for a in analyzed]
+    return score
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    batcher = None
+    request_timeout = 30.0
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send(200, self.batcher.stats())
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/score':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send(400, {'error': 'invalid JSON'})
+            return
+        if not isinstance(payload, dict):
+            self._send(400, {'error': 'expected a JSON object'})
+            return
+
+        single = 'headline' in payload
+        texts = [payload['headline']] if single else payload.get('headlines')
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            self._send(400, {'error': 'expected {"headline": str} or {"headlines": [str, ...]}'})
+            return
+
+        if len(texts) > self.batcher.max_queue:
+            self._send(413, {'error': f'at most {self.batcher.max_queue} headlines per request'})
+            return
+        try:
+            futures = self.batcher.submit_many(texts)
+        except QueueFull:
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            results = [f.result(timeout=self.request_timeout) for f in futures]
+        except Exception as e:
+            self._send(503, {'error': str(e)})
+            return
+        self._send(200, results[0] if single else {'results': results})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def make_server(host='127.0.0.1', port=8808, backend=None, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                max_wait_ms=DEFAULT_MAX_WAIT_MS, max_queue=DEFAULT_MAX_QUEUE):
+    """Build (server, batcher); call server.serve_forever() to run it."""
+    batcher = MicroBatcher(make_score_fn(backend, max_batch_size), max_batch_size, max_wait_ms, max_queue)
+    handler = type('BoundScoringHandler', (ScoringHandler,), {'batcher': batcher})
+    return ScoringServer((host, port), handler), batcher
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve sentiment scores over HTTP with micro-batching.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8808)
+    parser.add_argument('--backend', help='transformers, textblob or rules (default: first available)')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE)
+    args = parser.parse_args()
+
+    backend = warm_up(args.backend)
+    server, batcher = make_server(args.host, args.port, backend, args.max_batch_size,
+                                  args.max_wait_ms, args.max_queue)
+    print(f"[*] Scoring service ({backend}) on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()